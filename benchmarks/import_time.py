@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# ExcellentScraper - Import-time benchmark for the entry point and worker modules
+#
+# Each module is imported in a fresh interpreter several times and the median
+# wall time is reported, along with any heavy dependencies it pulled in.
+# Exits with status 1 if a headless module imports Tk, pandas or Selenium, or
+# if any module fails to import.
+#
+#   python benchmarks/import_time.py [--runs 10]
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies that are expensive to import
+HEAVY_MODULES = ['tkinter', 'customtkinter', 'PIL', 'pandas', 'numpy', 'openpyxl', 'selenium', 'webdriver_manager']
+
+# Modules that must never load these, because worker processes, watch mode and the CLI import them
+GUI_ONLY = ['tkinter', 'customtkinter', 'pandas', 'selenium']
+HEADLESS_MODULES = {
+    module: GUI_ONLY for module in (
+        'ExcellentScraper', 'scrape_worker', 'scraper_core', 'job_queue', 'frontier', 'watcher', 'watchlist',
+        'page_archive', 'dedup_index', 'record_store', 'search_index', 'profiling', 'structured_data',
+        'hydration_state', 'html_parsers', 'pagination',
+    )
+}
+
+# Modules that are only timed
+TIMED_MODULES = ['scraper_gui']
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def time_import(module, runs):
+    """Import a module in fresh interpreters and return (median seconds, heavy modules loaded)"""
+    timings = []
+    loaded = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=REPO_DIR, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return None, result.stderr.strip().splitlines()[-1]
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(data['seconds'])
+        loaded = data['loaded']
+    return statistics.median(timings), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time of ExcellentScraper modules")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters per module")
+    args = parser.parse_args()
+
+    failed = False
+    for module in list(HEADLESS_MODULES) + TIMED_MODULES:
+        seconds, loaded = time_import(module, args.runs)
+        if seconds is None:
+            print(f"{module:<18} ERROR: could not be imported: {loaded}")
+            failed = True
+            continue
+
+        print(f"{module:<18} {seconds * 1000:8.1f} ms   heavy: {', '.join(loaded) or '-'}")
+
+        forbidden = [m for m in HEADLESS_MODULES.get(module, []) if m in loaded]
+        if forbidden:
+            print(f"  ERROR: {module} must not import {', '.join(forbidden)}")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# ExcellentScraper - Near-duplicate article detection with MinHash LSH
+
+import re
+import array
+import hashlib
+import sqlite3
+
+# Articles shorter than this are too generic to compare ("No content found", cookie walls, ...)
+MIN_WORDS = 50
+
+# Number of consecutive words in a shingle
+SHINGLE_SIZE = 3
+
+# MinHash signature length, split into BANDS bands of ROWS values for LSH
+SIGNATURE_SIZE = 64
+BANDS = 16
+ROWS = SIGNATURE_SIZE // BANDS
+
+# Offset added to values borrowed from a neighbouring bin, so borrowed values stay distinct
+_BORROW_OFFSET = (1 << 32) // SIGNATURE_SIZE
+
+
+def _shingle_hashes(text):
+    """Hash every run of SHINGLE_SIZE words in a text, or return None if it's too short"""
+    words = re.findall(r'\w+', text.lower())
+    if len(words) < MIN_WORDS:
+        return None
+    return [
+        int.from_bytes(hashlib.blake2b(' '.join(words[i:i + SHINGLE_SIZE]).encode('utf-8'), digest_size=8).digest(), 'little')
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    ]
+
+
+def minhash_signature(text):
+    """Return the MinHash signature of a text's word shingles, or None if it's too short
+
+    Uses one-permutation hashing: each shingle is hashed once, the low bits
+    pick one of SIGNATURE_SIZE bins and the high 32 bits compete for that
+    bin's minimum. Empty bins borrow from the next filled bin. The share of
+    bins two signatures agree on estimates the Jaccard similarity of their
+    shingle sets, at the cost of one hash per shingle instead of one per
+    shingle per permutation.
+    """
+    hashes = _shingle_hashes(text)
+    if hashes is None:
+        return None
+
+    empty = 1 << 32
+    bins = [empty] * SIGNATURE_SIZE
+    for h in hashes:
+        index = h % SIGNATURE_SIZE
+        value = h >> 32
+        if value < bins[index]:
+            bins[index] = value
+
+    # Densify: fill empty bins from the nearest filled bin to the right
+    signature = list(bins)
+    for i in range(SIGNATURE_SIZE):
+        if bins[i] == empty:
+            for distance in range(1, SIGNATURE_SIZE):
+                neighbour = bins[(i + distance) % SIGNATURE_SIZE]
+                if neighbour != empty:
+                    signature[i] = (neighbour + distance * _BORROW_OFFSET) & 0xFFFFFFFF
+                    break
+    return signature
+
+
+def estimate_similarity(a, b):
+    """Estimate the Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / SIGNATURE_SIZE
+
+
+def _band_keys(signature):
+    """Hash each band of a signature into a signed 64-bit lookup key"""
+    keys = []
+    for band in range(BANDS):
+        values = array.array('I', signature[band * ROWS:(band + 1) * ROWS]).tobytes()
+        digest = hashlib.blake2b(bytes([band]) + values, digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+
+class DuplicateIndex:
+    """Persistent index of article signatures for near-duplicate lookups
+
+    Each signature is cut into 16 bands of 4 values and every band is
+    stored as an indexed key. Articles with a Jaccard similarity of 0.8
+    share at least one band with near certainty, while unrelated articles
+    almost never do, so a lookup only compares against the handful of
+    articles that share a band instead of scanning the whole corpus.
+    Exact copies are caught first through a hash of the normalized text.
+    """
+
+    def __init__(self, path, threshold=0.8):
+        self.path = path
+        self.threshold = threshold
+
+        self.conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                url TEXT UNIQUE NOT NULL,
+                content_hash TEXT NOT NULL,
+                signature BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS articles_hash ON articles (content_hash);
+            CREATE TABLE IF NOT EXISTS bands (
+                key INTEGER NOT NULL,
+                article_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS bands_key ON bands (key);
+            CREATE INDEX IF NOT EXISTS bands_article ON bands (article_id);
+        """)
+
+    def close(self):
+        """Close the index database"""
+        self.conn.close()
+
+    def _fingerprint(self, content):
+        """Return (content_hash, signature) for a text, or None if it's too short"""
+        signature = minhash_signature(content)
+        if signature is None:
+            return None
+        normalized = ' '.join(re.findall(r'\w+', content.lower()))
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest(), signature
+
+    def _lookup(self, url, content_hash, signature, keys):
+        """Find an already indexed article (other than url) that matches"""
+        row = self.conn.execute(
+            "SELECT url FROM articles WHERE content_hash = ? AND url != ? LIMIT 1", (content_hash, url)
+        ).fetchone()
+        if row:
+            return row[0]
+
+        candidates = self.conn.execute(
+            f"SELECT DISTINCT a.url, a.signature FROM bands b JOIN articles a ON a.id = b.article_id "
+            f"WHERE b.key IN ({', '.join('?' * len(keys))}) AND a.url != ?",
+            (*keys, url)
+        )
+        for candidate_url, candidate_signature in candidates:
+            if estimate_similarity(signature, array.array('I', candidate_signature)) >= self.threshold:
+                return candidate_url
+        return None
+
+    def find_duplicate(self, url, content):
+        """Return the URL of an indexed near-duplicate of this article, or None"""
+        fingerprint = self._fingerprint(content)
+        if fingerprint is None:
+            return None
+        content_hash, signature = fingerprint
+        return self._lookup(url, content_hash, signature, _band_keys(signature))
+
+    def check_and_add(self, url, content):
+        """Look for a near-duplicate, then index the article if it is original
+
+        Returns the URL of the earlier copy, or None. Duplicates are not
+        added, so every later copy is matched against the first one seen.
+        The lookup and the insert share one write transaction, so workers
+        indexing copies of the same story at once can't both miss each other.
+        """
+        fingerprint = self._fingerprint(content)
+        if fingerprint is None:
+            return None
+
+        content_hash, signature = fingerprint
+        keys = _band_keys(signature)
+        with self.conn:
+            # Take the write lock before looking, not just before inserting
+            self.conn.execute("BEGIN IMMEDIATE")
+            duplicate_of = self._lookup(url, content_hash, signature, keys)
+            if duplicate_of is None:
+                # Replace any earlier version of the same URL
+                row = self.conn.execute("SELECT id FROM articles WHERE url = ?", (url,)).fetchone()
+                if row:
+                    self.conn.execute("DELETE FROM bands WHERE article_id = ?", (row[0],))
+                    self.conn.execute("DELETE FROM articles WHERE id = ?", (row[0],))
+                cursor = self.conn.execute(
+                    "INSERT INTO articles (url, content_hash, signature) VALUES (?, ?, ?)",
+                    (url, content_hash, array.array('I', signature).tobytes())
+                )
+                self.conn.executemany(
+                    "INSERT INTO bands (key, article_id) VALUES (?, ?)",
+                    [(key, cursor.lastrowid) for key in keys]
+                )
+        return duplicate_of
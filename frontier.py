@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# ExcellentScraper - URL discovery from sitemaps, feeds and same-site links
+
+import math
+import zlib
+import hashlib
+import sqlite3
+import xml.etree.ElementTree as ET
+from urllib.parse import urlsplit, urlunsplit, urljoin, parse_qsl, urlencode
+import requests
+from bs4 import BeautifulSoup
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid',
+    'ref', 'ref_src', 'cmpid', 'ncid', 'ocid', 'sr_share', 'amp'
+}
+
+# Links to these files are never articles
+SKIPPED_EXTENSIONS = (
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico', '.css', '.js',
+    '.pdf', '.zip', '.gz', '.mp3', '.mp4', '.mov', '.avi', '.xml', '.json'
+)
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+}
+
+
+def canonicalize_url(url):
+    """Normalize a URL so trivially different spellings compare equal"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+
+    # Drop default ports
+    if parts.port and not ((scheme == 'http' and parts.port == 80) or (scheme == 'https' and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+
+    # Drop tracking parameters and sort the rest so parameter order doesn't matter
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS]
+    query.sort()
+
+    path = parts.path or '/'
+
+    # The fragment never changes what the server returns
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+def _site_of(url):
+    """Return the host of a URL without a leading www."""
+    host = (urlsplit(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class BloomFilter:
+    """Fixed-size set membership test that never forgets a URL it has seen
+
+    Ten million URLs at a 0.1% false positive rate fit in about 18 MB, so
+    the seen-set stays small no matter how large the crawl gets. A false
+    positive only means a URL is skipped, never that one is fetched twice.
+    """
+
+    def __init__(self, capacity=10_000_000, error_rate=0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        """Derive the bit positions for an item using double hashing"""
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        """Add an item, returning False if it was (probably) already present"""
+        added = False
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, item):
+        return all(self.bits[position // 8] & (1 << (position % 8)) for position in self._positions(item))
+
+
+class Frontier:
+    """Prioritized queue of URLs to scrape, discovered from a seed site
+
+    Pending URLs live in a SQLite table on disk rather than in memory, and
+    the seen-set is a Bloom filter, so a crawl can discover millions of
+    URLs while only holding a few megabytes. Iterating over the frontier
+    yields URLs shallowest first, so it can be handed straight to the
+    scraping loop; links found on scraped pages are fed back with
+    add_links().
+    """
+
+    def __init__(self, seed_url, path="", max_depth=2, max_urls=1000, same_site=True,
+                 expected_urls=10_000_000, status_callback=None):
+        self.seed_url = canonicalize_url(seed_url)
+        self.site = _site_of(self.seed_url)
+        self.max_depth = max_depth
+        self.max_urls = max_urls
+        self.same_site = same_site
+        self.status_callback = status_callback or print
+        self.seen = BloomFilter(capacity=expected_urls)
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+
+        # Depth of the URL most recently handed out, so its links go one level deeper
+        self.current_depth = 0
+        self.popped = 0
+
+        # An empty path gives a private temporary database that SQLite deletes on close
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                url TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+                priority REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS frontier_order ON frontier (depth, priority DESC);
+        """)
+
+    def _update_status(self, message):
+        """Report a progress message"""
+        self.status_callback(message)
+
+    def close(self):
+        """Close the frontier database"""
+        self.conn.close()
+
+    def add(self, url, depth=0, priority=0.5):
+        """Queue a URL unless it was seen before or falls outside the crawl limits"""
+        if depth > self.max_depth:
+            return False
+
+        try:
+            url = canonicalize_url(url)
+        except ValueError:
+            return False
+
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            return False
+        if self.same_site and _site_of(url) != self.site:
+            return False
+        if parts.path.lower().endswith(SKIPPED_EXTENSIONS):
+            return False
+
+        if not self.seen.add(url):
+            return False
+
+        self.conn.execute("INSERT INTO frontier (url, depth, priority) VALUES (?, ?, ?)", (url, depth, priority))
+        return True
+
+    def add_links(self, links):
+        """Queue links found on the page most recently handed out"""
+        added = 0
+        with self.conn:
+            for link in links:
+                if self.add(link, depth=self.current_depth + 1):
+                    added += 1
+        return added
+
+    def pop(self):
+        """Remove and return the next URL to scrape, or None when done"""
+        if self.max_urls is not None and self.popped >= self.max_urls:
+            return None
+
+        row = self.conn.execute(
+            "SELECT rowid, url, depth FROM frontier ORDER BY depth, priority DESC, rowid LIMIT 1"
+        ).fetchone()
+        if row is None:
+            return None
+
+        rowid, url, depth = row
+        with self.conn:
+            self.conn.execute("DELETE FROM frontier WHERE rowid = ?", (rowid,))
+        self.current_depth = depth
+        self.popped += 1
+        return url
+
+    def __iter__(self):
+        while True:
+            url = self.pop()
+            if url is None:
+                return
+            yield url
+
+    def pending(self):
+        """Return the number of URLs waiting to be scraped"""
+        return self.conn.execute("SELECT COUNT(*) FROM frontier").fetchone()[0]
+
+    def discover(self):
+        """Seed the frontier from the site's robots.txt, sitemaps and feeds"""
+        parts = urlsplit(self.seed_url)
+        root = f"{parts.scheme}://{parts.netloc}"
+
+        # The seed itself goes first, so its links are followed even without a sitemap
+        self.add(self.seed_url, depth=0, priority=1.0)
+
+        # Sitemaps listed in robots.txt, or the conventional location
+        sitemaps = []
+        try:
+            response = self.session.get(f"{root}/robots.txt", timeout=30)
+            if response.ok:
+                for line in response.text.splitlines():
+                    if line.lower().startswith('sitemap:'):
+                        sitemaps.append(line.split(':', 1)[1].strip())
+        except requests.RequestException as e:
+            self._update_status(f"Could not read robots.txt: {str(e)}")
+        if not sitemaps:
+            sitemaps.append(f"{root}/sitemap.xml")
+
+        for sitemap_url in sitemaps:
+            self.add_sitemap(sitemap_url)
+
+        # RSS/Atom feeds advertised by the seed page
+        try:
+            response = self.session.get(self.seed_url, timeout=30)
+            if response.ok:
+                soup = BeautifulSoup(response.text, 'html.parser')
+                for link in soup.find_all('link', attrs={'rel': 'alternate'}):
+                    feed_type = (link.get('type') or '').lower()
+                    if ('rss' in feed_type or 'atom' in feed_type) and link.get('href'):
+                        self.add_feed(urljoin(response.url, link['href']))
+        except requests.RequestException as e:
+            self._update_status(f"Could not read seed page for feeds: {str(e)}")
+
+        self.conn.commit()
+        self._update_status(f"Discovered {self.pending()} URLs to scrape from {self.site}")
+
+    def add_sitemap(self, sitemap_url):
+        """Queue every page listed in a sitemap, following sitemap indexes"""
+        to_visit = [sitemap_url]
+        visited = set()
+        while to_visit:
+            url = to_visit.pop()
+            if url in visited:
+                continue
+            visited.add(url)
+            for kind, loc, priority in self._iter_xml_links(url):
+                if kind == 'sitemap':
+                    to_visit.append(loc)
+                else:
+                    self.add(loc, depth=1, priority=priority)
+            self.conn.commit()
+
+    def add_feed(self, feed_url):
+        """Queue every article linked from an RSS or Atom feed"""
+        for _, link, priority in self._iter_xml_links(feed_url):
+            # Feed entries are usually the newest articles, so rank them first
+            self.add(link, depth=1, priority=max(priority, 0.9))
+        self.conn.commit()
+
+    def _iter_xml_links(self, url):
+        """Stream (kind, url, priority) entries out of a sitemap or feed
+
+        The document is parsed incrementally and each entry is discarded
+        once read, so multi-gigabyte sitemaps don't have to fit in memory.
+        """
+        try:
+            response = self.session.get(url, timeout=30, stream=True)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            self._update_status(f"Could not fetch {url}: {str(e)}")
+            return
+
+        parser = ET.XMLPullParser(events=('end',))
+        decompressor = None
+        try:
+            # iter_content undoes Content-Encoding; a gzipped file body is handled here
+            for i, chunk in enumerate(response.iter_content(chunk_size=64 * 1024)):
+                if i == 0 and chunk[:2] == b'\x1f\x8b':
+                    decompressor = zlib.decompressobj(wbits=31)
+                parser.feed(decompressor.decompress(chunk) if decompressor else chunk)
+                yield from self._read_xml_events(parser, url)
+            parser.close()
+            yield from self._read_xml_events(parser, url)
+        except (ET.ParseError, zlib.error, requests.RequestException) as e:
+            self._update_status(f"Could not parse {url}: {str(e)}")
+        finally:
+            response.close()
+
+    def _read_xml_events(self, parser, url):
+        """Turn the elements parsed so far into (kind, url, priority) entries"""
+        for _, element in parser.read_events():
+            tag = element.tag.rsplit('}', 1)[-1]
+
+            if tag in ('url', 'sitemap'):
+                loc, priority = None, 0.5
+                for child in element:
+                    child_tag = child.tag.rsplit('}', 1)[-1]
+                    if child_tag == 'loc' and child.text:
+                        loc = child.text.strip()
+                    elif child_tag == 'priority' and child.text:
+                        try:
+                            priority = float(child.text)
+                        except ValueError:
+                            pass
+                if loc:
+                    yield ('sitemap' if tag == 'sitemap' else 'page'), loc, priority
+                element.clear()
+
+            elif tag == 'item':
+                # RSS: <link> text, or a permalink <guid>
+                for child in element:
+                    child_tag = child.tag.rsplit('}', 1)[-1]
+                    if child_tag in ('link', 'guid') and child.text and child.text.strip().startswith('http'):
+                        yield 'page', child.text.strip(), 0.5
+                        break
+                element.clear()
+
+            elif tag == 'entry':
+                # Atom: <link rel="alternate" href="...">
+                for child in element:
+                    if child.tag.rsplit('}', 1)[-1] == 'link' and child.get('rel', 'alternate') == 'alternate' and child.get('href'):
+                        yield 'page', urljoin(url, child.get('href')), 0.5
+                        break
+                element.clear()
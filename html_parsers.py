@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# ExcellentScraper - HTML parser backends, picked once per document
+
+import re
+import functools
+import importlib.util
+from bs4 import BeautifulSoup
+
+# Elements that never hold article text; dropping them before parsing saves building their subtrees
+NOISE_TAGS = ('script', 'style', 'svg', 'noscript', 'iframe', 'template')
+
+# Comments, self-closing noise tags (<svg class="icon"/>), and noise elements with their contents. An opening
+# tag ending in "/>" has no closing tag, so matching up to the next </svg> would swallow the text in between.
+# The tag name must end at whitespace, "/" or ">", since custom elements such as <svg-icon> aren't noise
+_NOISE_RE = re.compile(
+    r'<!--.*?-->'
+    r'|<(?:' + '|'.join(NOISE_TAGS) + r')(?=[\s/>])[^>]*/>'
+    r'|<(' + '|'.join(NOISE_TAGS) + r')(?=[\s/>])[^>]*(?<!/)>.*?</\1\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Registered backends: name -> (function taking HTML text and returning a BeautifulSoup, required module)
+_backends = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _module_available(module):
+    """Check whether an optional parser package is installed, without importing it"""
+    return importlib.util.find_spec(module) is not None
+
+
+def strip_noise(html):
+    """Cut scripts, styles, SVG, iframes and comments out of a document before it is parsed
+
+    BeautifulSoup's SoupStrainer keeps every descendant of an element it
+    matches, so it can't drop the noise nested inside <body>; removing it
+    from the text does. Script, style and iframe contents end at the first
+    matching close tag in HTML too, so this doesn't change what's left.
+    """
+    return _NOISE_RE.sub('', html)
+
+
+def register_backend(name, parse, module=None):
+    """Make a parser available to parse_html; module is the package it needs installed, if any"""
+    _backends[name] = (parse, module)
+
+
+def available_backends():
+    """Return the names of the backends whose packages are installed"""
+    return [name for name, (_, module) in _backends.items() if module is None or _module_available(module)]
+
+
+def _looks_broken(html):
+    """Cheap sniff for markup a lenient HTML5 parser should repair: unbalanced divs or tables
+
+    Takes the document after strip_noise, so divs inside scripts, inline
+    templates and comments don't count.
+    """
+    lower = html.lower()
+    opened, closed = lower.count('<div'), lower.count('</div')
+    if abs(opened - closed) > max(5, opened // 10):
+        return True
+    return lower.count('<table') != lower.count('</table')
+
+
+def choose_backend(html):
+    """Pick the backend for a document (already passed through strip_noise) from a quick look at its markup
+
+    Broken markup goes to html5lib, which repairs it the way browsers do,
+    when it's installed. Everything else is parsed with lxml, and
+    html.parser is the last resort when lxml isn't installed.
+    """
+    available = available_backends()
+    if _looks_broken(html) and 'html5lib' in available:
+        return 'html5lib'
+    return 'lxml' if 'lxml' in available else 'html.parser'
+
+
+def parse_html(html, backend=None, stripped=False):
+    """Parse a document once with the given or sniffed backend, returning (soup, backend name)
+
+    Noise is stripped first, unless stripped says the caller already ran
+    strip_noise on the text.
+    """
+    if not stripped:
+        html = strip_noise(html)
+    name = backend or choose_backend(html)
+    parse, _ = _backends[name]
+    try:
+        return parse(html), name
+    except Exception:
+        if name == 'html.parser':
+            raise
+        # A backend that chokes on a document shouldn't lose the page
+        return _backends['html.parser'][0](html), 'html.parser'
+
+
+# Backends are handed text that strip_noise has already cleaned
+register_backend('lxml', lambda html: BeautifulSoup(html, 'lxml'), 'lxml')
+register_backend('html5lib', lambda html: BeautifulSoup(html, 'html5lib'), 'html5lib')
+register_backend('html.parser', lambda html: BeautifulSoup(html, 'html.parser'))
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+# ExcellentScraper - Read articles out of the app state that JavaScript frameworks embed in the page
+
+import re
+import html
+import json
+import datetime
+from urllib.parse import urlsplit
+from structured_data import MIN_BODY_WORDS, text_paragraphs
+
+# <script id="__NEXT_DATA__" type="application/json"> (Next.js) and <script id="__NUXT_DATA__"> (Nuxt 3)
+_STATE_SCRIPT_RE = re.compile(
+    r'<script[^>]*id\s*=\s*["\']?(__NEXT_DATA__|__NUXT_DATA__)["\']?[^>]*>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL
+)
+
+# window.__INITIAL_STATE__ = {...}, window.__APOLLO_STATE__ = JSON.parse("...") and friends
+_STATE_ASSIGNMENT_RE = re.compile(
+    r'(__(?:INITIAL_STATE|PRELOADED_STATE|APOLLO_STATE|NUXT|APP_STATE|REDUX_STATE|STATE|DATA)__)\s*=\s*(JSON\.parse\(\s*)?'
+)
+_UNDEFINED_RE = re.compile(r'(?<=[:\[,])\s*undefined\s*(?=[,}\]])')
+_UNESCAPED_QUOTE_RE = re.compile(r'(?<!\\)"')
+
+# Field names frameworks and headless CMSes use for each part of an article
+BODY_KEYS = ('articleBody', 'body', 'bodyHtml', 'body_html', 'content', 'contentHtml', 'content_html', 'html',
+             'text', 'bodyText', 'articleText', 'story', 'blocks', 'paragraphs')
+TITLE_KEYS = ('headline', 'title', 'seoTitle', 'name')
+AUTHOR_KEYS = ('author', 'authors', 'byline', 'creator', 'writer')
+PUBLISHED_KEYS = ('datePublished', 'publishedAt', 'published_at', 'publishDate', 'publishedDate', 'firstPublished',
+                  'createdAt', 'date')
+MODIFIED_KEYS = ('dateModified', 'updatedAt', 'updated_at', 'modifiedAt', 'lastModified', 'modified')
+
+# Wrappers around a rich-text or HTML value ({"rendered": "<p>..."} in WordPress, {"html": ...} in many CMSes)
+_WRAPPER_KEYS = ('html', 'rendered', 'text', 'value', 'raw', 'json', 'document', 'content')
+
+# Keys holding the text or children of a rich-text block
+_BLOCK_TEXT_KEYS = ('text', 'value', 'content', 'children', 'html', 'plaintext', 'innerHTML')
+
+_HEADING_TAG_RE = re.compile(r'<h([1-3])[^>]*>(.*?)</h\1\s*>', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# The page's own idea of its title, to tell its article from related stories held in the same state
+_TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title\s*>', re.IGNORECASE | re.DOTALL)
+_META_TITLE_RE = re.compile(r'<meta\s[^>]*(?:property|name)\s*=\s*["\']?(?:og:title|twitter:title)\b[^>]*>', re.IGNORECASE)
+_CONTENT_ATTR_RE = re.compile(r'content\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+_WORD_RE = re.compile(r'[^\W\d_]+')
+
+# Share of a title's words that must appear in the page title, or of the URL slug's words in the title
+TITLE_MATCH = 0.8
+SLUG_MATCH = 0.6
+
+
+def has_app_state(raw):
+    """Cheap check on the raw bytes for any state blob this module understands"""
+    return b'__NEXT_DATA__' in raw or b'__NUXT' in raw or b'_STATE__' in raw or b'__DATA__' in raw
+
+
+def _balanced_end(text, start):
+    """Return the index just past the JSON object or array starting at text[start], or None"""
+    depth = 0
+    quote = None
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if quote:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in '{[':
+            depth += 1
+        elif char in '}]':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return None
+
+
+def _string_literal(text, start):
+    """Decode the JavaScript string literal starting at text[start]"""
+    quote = text[start]
+    escaped = False
+    for end in range(start + 1, len(text)):
+        char = text[end]
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char == quote:
+            inner = text[start + 1:end]
+            if quote == "'":
+                inner = _UNESCAPED_QUOTE_RE.sub('\\"', inner.replace("\\'", "'"))
+            return json.loads('"' + inner + '"', strict=False)
+    raise ValueError("Unterminated string literal")
+
+
+def _loads(text):
+    """Parse JSON, tolerating the bare undefined values JavaScript serializers leave behind"""
+    try:
+        return json.loads(text, strict=False)
+    except ValueError:
+        return json.loads(_UNDEFINED_RE.sub(' null', text), strict=False)
+
+
+def _revive_devalue(values):
+    """Rebuild a Nuxt 3 payload, a flat array whose containers point at other entries by index"""
+    revived = {}
+
+    def revive(index):
+        if not isinstance(index, int) or not 0 <= index < len(values):
+            return None
+        if index in revived:
+            return revived[index]
+        value = values[index]
+        if isinstance(value, list):
+            if value and isinstance(value[0], str):
+                # Wrapped values: ["Reactive", 1], ["Ref", 2], ["Date", "2024-01-01T..."], ["Set", 3, 4]
+                if value[0] == 'Date':
+                    revived[index] = value[1] if len(value) > 1 else None
+                elif value[0] in ('Set', 'Map'):
+                    revived[index] = [revive(item) for item in value[1:]]
+                else:
+                    revived[index] = revive(value[1]) if len(value) > 1 else None
+                return revived[index]
+            result = revived[index] = []
+            result.extend(revive(item) for item in value)
+            return result
+        if isinstance(value, dict):
+            result = revived[index] = {}
+            for key, item in value.items():
+                result[key] = revive(item)
+            return result
+        return value
+
+    return revive(0)
+
+
+def _iter_states(text):
+    """Yield every framework state blob in a decoded page, as Python objects
+
+    Nuxt 2 serializes its state as a JavaScript function call rather than
+    JSON, so only its data-only variants are understood. Blobs nested too
+    deeply to decode are skipped.
+    """
+    for match in _STATE_SCRIPT_RE.finditer(text):
+        try:
+            data = _loads(match.group(2).strip())
+            if match.group(1) == '__NUXT_DATA__' and isinstance(data, list):
+                data = _revive_devalue(data)
+        except (ValueError, RecursionError):
+            continue
+        yield data
+
+    for match in _STATE_ASSIGNMENT_RE.finditer(text):
+        start = match.end()
+        try:
+            if match.group(2) and text[start:start + 1] in ('"', "'"):
+                # window.__INITIAL_STATE__ = JSON.parse("{\"article\": ...}")
+                yield _loads(_string_literal(text, start))
+            elif text[start:start + 1] in ('{', '['):
+                end = _balanced_end(text, start)
+                if end:
+                    yield _loads(text[start:end])
+        except (ValueError, RecursionError):
+            continue
+
+
+def _iter_dicts(state):
+    """Yield every dict in a decoded state, parents before children, visiting shared objects once"""
+    seen = set()
+    stack = [state]
+    while stack:
+        value = stack.pop()
+        if not isinstance(value, (dict, list)) or id(value) in seen:
+            continue
+        seen.add(id(value))
+        if isinstance(value, dict):
+            yield value
+            stack.extend(reversed(list(value.values())))
+        else:
+            stack.extend(reversed(value))
+
+
+def _apollo_cache(state):
+    """Collect the objects of any Apollo normalized caches in a state, keyed by cache id"""
+    cache = {}
+    for item in _iter_dicts(state):
+        if 'ROOT_QUERY' in item:
+            cache.update((key, value) for key, value in item.items() if isinstance(value, dict))
+    return cache
+
+
+def _resolve(value, cache):
+    """Follow an Apollo cache reference ({"__ref": "Author:1"}) to the object it points at"""
+    if isinstance(value, dict) and cache:
+        ref = value.get('__ref') or (value.get('id') if value.get('type') == 'id' else None)
+        if isinstance(ref, str) and ref in cache:
+            return cache[ref]
+    return value
+
+
+def _first_string(item, keys, cache):
+    """Return the first non-empty string among a set of keys, looking inside wrapper objects"""
+    for key in keys:
+        value = _resolve(item.get(key), cache)
+        if isinstance(value, dict):
+            value = next((value[wrapper] for wrapper in ('rendered', 'text', 'value') if isinstance(value.get(wrapper), str)), None)
+        if isinstance(value, str) and value.strip():
+            return ' '.join(_TAG_RE.sub(' ', value).split())
+    return ''
+
+
+def _names(value, cache):
+    """Flatten an author value (string, object, list or cache reference) into a comma-separated string"""
+    value = _resolve(value, cache)
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return _first_string(value, ('name', 'displayName', 'fullName', 'title'), cache)
+    if isinstance(value, list):
+        return ', '.join(name for name in (_names(item, cache) for item in value) if name)
+    return ''
+
+
+def _author(item, cache):
+    """Return an object's author names, or an empty string"""
+    try:
+        return _names(next((item[key] for key in AUTHOR_KEYS if item.get(key)), None), cache)
+    except RecursionError:
+        return ''
+
+
+def _date(item, keys):
+    """Return the first date among a set of keys as a string, converting epoch numbers to ISO 8601"""
+    for key in keys:
+        value = item.get(key)
+        if isinstance(value, bool) or value in (None, ''):
+            continue
+        if isinstance(value, (int, float)):
+            # Epoch milliseconds or seconds
+            seconds = value / 1000 if value > 1e11 else value
+            try:
+                return datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc).isoformat()
+            except (OverflowError, OSError, ValueError):
+                # Not a real date (a NaN, or years out of range), so it's no date at all
+                return ''
+        if isinstance(value, str):
+            return value.strip()
+    return ''
+
+
+def _block_text(block, cache):
+    """Concatenate all the text inside one rich-text block"""
+    block = _resolve(block, cache)
+    if isinstance(block, str):
+        return block
+    if isinstance(block, list):
+        return ''.join(_block_text(child, cache) for child in block)
+    if isinstance(block, dict):
+        return ''.join(_block_text(block[key], cache) for key in _BLOCK_TEXT_KEYS if key in block)
+    return ''
+
+
+def _is_heading_block(block):
+    """Check whether a rich-text block is a heading"""
+    kind = ' '.join(str(block.get(key, '')) for key in ('type', 'nodeType', '_type', 'style', 'tag', 'blockName'))
+    return 'heading' in kind.lower() or re.search(r'\bh[1-3]\b', kind.lower()) is not None
+
+
+def _body_of(item, cache):
+    """Return (content, headings) for an object's article body field, or None if it has none"""
+    for key in BODY_KEYS:
+        value = _resolve(item.get(key), cache)
+        if isinstance(value, dict):
+            value = next((_resolve(value[wrapper], cache) for wrapper in _WRAPPER_KEYS if wrapper in value), None)
+            if isinstance(value, dict):
+                # Rich-text documents keep their blocks one level further down
+                value = value.get('content') or value.get('children') or value.get('blocks')
+
+        if isinstance(value, str):
+            if len(value) < MIN_BODY_WORDS * 4:
+                continue
+            headings = [' '.join(_TAG_RE.sub(' ', match.group(2)).split()) for match in _HEADING_TAG_RE.finditer(value)]
+            return text_paragraphs(value), headings
+
+        if isinstance(value, list) and value:
+            paragraphs = []
+            headings = []
+            for block in value:
+                block = _resolve(block, cache)
+                text = ' '.join(_TAG_RE.sub(' ', _block_text(block, cache)).split())
+                if not text:
+                    continue
+                if isinstance(block, dict) and _is_heading_block(block):
+                    headings.append(text)
+                else:
+                    paragraphs.append(text)
+            if paragraphs:
+                return "\n\n".join(paragraphs), headings
+    return None
+
+
+def _words(text):
+    """Lowercase words of a title or slug, without numbers or punctuation"""
+    return set(_WORD_RE.findall(html.unescape(text).lower()))
+
+
+def _page_identity(text, url):
+    """Return (word sets of the page's <title> and og:title, words of the URL slug) to match candidates against"""
+    titles = [match.group(1) for match in _TITLE_RE.finditer(text)]
+    for match in _META_TITLE_RE.finditer(text):
+        content = _CONTENT_ATTR_RE.search(match.group(0))
+        if content:
+            titles.append(content.group(1) or content.group(2) or '')
+    title_words = [words for words in (_words(title) for title in titles) if words]
+
+    slug_words = set()
+    if url:
+        # The last path segment with words in it; /2024/05/some-story-slug/ and /story/some-slug-123 both work
+        for segment in reversed(urlsplit(url).path.split('/')):
+            slug_words = _words(re.sub(r'\.[a-z]{2,5}$', '', segment).replace('-', ' ').replace('_', ' '))
+            if len(slug_words) >= 2:
+                break
+    return title_words, slug_words if len(slug_words) >= 2 else set()
+
+
+def _matches_page(title, title_words, slug_words):
+    """Check whether a candidate's title is the page's own: found in its <title> or og:title, or in its URL slug"""
+    words = _words(title)
+    if not words:
+        return False
+    for page_words in title_words:
+        # <title> usually adds the site name, so only the candidate's words have to be in it
+        if len(words & page_words) >= TITLE_MATCH * len(words):
+            return True
+    return bool(slug_words) and len(words & slug_words) >= SLUG_MATCH * len(slug_words)
+
+
+def find_hydrated_article(raw, encoding=None, url=None):
+    """Return the article held in a page's framework state, or None
+
+    Looks in Next.js __NEXT_DATA__, Nuxt payloads, window.__INITIAL_STATE__
+    style Redux/Vuex stores and Apollo caches. State often holds related
+    and recommended stories as well, so only objects whose title matches
+    the page (its <title>, og:title or the slug of url) are considered.
+    Of those, the one with the longest body field (a string of text or
+    HTML, or a list of rich-text blocks) wins, provided the body is long
+    enough to be the whole article. Returns the same fields as
+    find_json_ld_article plus the headings found inside the body.
+    """
+    if not has_app_state(raw):
+        return None
+
+    text = raw.decode(encoding or 'utf-8', errors='replace')
+    title_words, slug_words = _page_identity(text, url)
+    if not title_words and not slug_words:
+        # Nothing to tell the page's article from the others apart
+        return None
+
+    best = None
+    best_words = 0
+    for state in _iter_states(text):
+        cache = _apollo_cache(state)
+        for item in _iter_dicts(state):
+            try:
+                body = _body_of(item, cache)
+            except RecursionError:
+                # Rich text nested deeper than Python's stack allows; not worth a crash
+                continue
+            if body is None:
+                continue
+            content, headings = body
+            words = len(content.split())
+            if words < MIN_BODY_WORDS or words <= best_words:
+                continue
+            title = _first_string(item, TITLE_KEYS, cache)
+            if not title or not _matches_page(title, title_words, slug_words):
+                continue
+            best_words = words
+            best = {
+                'title': title,
+                'content': content,
+                'headings': [title] + [heading for heading in headings if heading and heading != title],
+                'author': _author(item, cache),
+                'date_published': _date(item, PUBLISHED_KEYS),
+                'date_modified': _date(item, MODIFIED_KEYS)
+            }
+    return best
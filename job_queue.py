@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# ExcellentScraper - Shared SQLite job queue and result store for worker fleets
+
+import json
+import time
+import sqlite3
+import contextlib
+from urllib.parse import urlparse
+from record_store import compress_text, decompress_text, METADATA_KEYS
+
+
+class JobQueue:
+    """URL queue with leases and heartbeats, backed by a single SQLite file
+
+    Any number of worker processes on this host can open the same
+    database. A worker claims a URL by taking a lease on it and keeps the
+    lease alive with heartbeats; if the worker crashes, the lease expires
+    and the URL is handed to the next worker that asks for one. The file
+    is in WAL mode, whose shared-memory index only works between processes
+    on one machine, so it must not be shared over a network filesystem.
+    """
+
+    def __init__(self, path, lease_seconds=120, max_attempts=3, domain_delay=1.0):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # Minimum gap between two requests to the same domain, across all workers
+        self.domain_delay = domain_delay
+
+        # Autocommit mode so we control transactions explicitly
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        """Create the queue tables if they don't exist yet"""
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                url TEXT PRIMARY KEY,
+                domain TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                worker_id TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                enqueued_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_expires);
+            CREATE INDEX IF NOT EXISTS jobs_domain ON jobs (status, domain);
+            CREATE TABLE IF NOT EXISTS domains (
+                domain TEXT PRIMARY KEY,
+                next_allowed REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                url TEXT PRIMARY KEY,
+                title TEXT,
+                headings TEXT,
+                content TEXT,
+                timestamp TEXT,
+                worker_id TEXT,
+                finished_at REAL NOT NULL,
+                duplicate_of TEXT,
+                metadata TEXT
+            );
+        """)
+
+        # Queues created by older versions lack the later columns
+        for column in ("duplicate_of", "metadata"):
+            try:
+                self.conn.execute(f"ALTER TABLE results ADD COLUMN {column} TEXT")
+            except sqlite3.OperationalError:
+                pass
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Run a block of statements as one write transaction
+
+        The connection is in autocommit mode, where "with self.conn" doesn't
+        open a transaction, so every statement would commit on its own.
+        BEGIN IMMEDIATE takes the write lock up front, so two workers can't
+        interleave their reads and writes.
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def enqueue(self, urls):
+        """Add URLs to the queue, ignoring ones that are already known"""
+        now = time.time()
+        rows = [(url, urlparse(url).netloc.lower(), now) for url in urls]
+        with self._transaction():
+            cursor = self.conn.executemany(
+                "INSERT OR IGNORE INTO jobs (url, domain, enqueued_at) VALUES (?, ?, ?)", rows
+            )
+        return cursor.rowcount
+
+    def claim(self, worker_id):
+        """Lease the next available URL to a worker, or return None
+
+        A URL is available if it is pending, or if its previous lease expired
+        because the worker holding it stopped sending heartbeats. URLs whose
+        domain was hit too recently by any worker are skipped for now.
+
+        The domain is picked before the URL: the pending domains are walked
+        through the (status, domain) index one lookup each, and the oldest
+        URL of each domain that isn't cooling down is a single index probe.
+        A claim therefore costs one lookup per domain rather than a sort of
+        every pending URL, which matters while the lock is held.
+        """
+        now = time.time()
+        with self._transaction():
+            # Expired leases go back to pending; URLs that keep killing their workers are given up on instead
+            self.conn.execute("""
+                UPDATE jobs
+                SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    error = CASE WHEN attempts >= ? THEN 'Lease expired too many times' ELSE error END,
+                    worker_id = NULL, lease_expires = NULL
+                WHERE status = 'leased' AND lease_expires < ?
+            """, (self.max_attempts, self.max_attempts, now))
+
+            row = self.conn.execute("""
+                WITH RECURSIVE pending_domains(domain) AS (
+                    SELECT MIN(domain) FROM jobs WHERE status = 'pending'
+                    UNION ALL
+                    SELECT (SELECT MIN(domain) FROM jobs WHERE status = 'pending' AND domain > p.domain)
+                    FROM pending_domains p WHERE p.domain IS NOT NULL
+                )
+                SELECT j.url, j.domain FROM pending_domains p
+                JOIN jobs j ON j.rowid = (
+                    SELECT rowid FROM jobs WHERE status = 'pending' AND domain = p.domain ORDER BY rowid LIMIT 1
+                )
+                WHERE p.domain NOT IN (SELECT domain FROM domains WHERE next_allowed > ?)
+                ORDER BY j.rowid
+                LIMIT 1
+            """, (now,)).fetchone()
+
+            if row is None:
+                return None
+
+            url, domain = row
+            self.conn.execute(
+                "UPDATE jobs SET status = 'leased', worker_id = ?, lease_expires = ?, attempts = attempts + 1 WHERE url = ?",
+                (worker_id, now + self.lease_seconds, url)
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO domains (domain, next_allowed) VALUES (?, ?)",
+                (domain, now + self.domain_delay)
+            )
+            return url
+
+    def heartbeat(self, worker_id):
+        """Extend the leases of every URL the worker is holding"""
+        with self._transaction():
+            self.conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE worker_id = ? AND status = 'leased'",
+                (time.time() + self.lease_seconds, worker_id)
+            )
+
+    def complete(self, url, worker_id, article_data):
+        """Store a scraped article and mark its URL as done, if the worker still holds the lease
+
+        Returns False, storing nothing, when the lease expired and the URL
+        went back to the queue or to another worker in the meantime.
+        """
+        metadata = {key: article_data[key] for key in METADATA_KEYS if article_data.get(key)}
+        with self._transaction():
+            if not self._release(url, worker_id, 'done', None):
+                return False
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results "
+                "(url, title, headings, content, timestamp, worker_id, finished_at, duplicate_of, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, article_data['title'], json.dumps(article_data['headings']), compress_text(article_data['content']),
+                 article_data['timestamp'], worker_id, time.time(), article_data.get('duplicate_of'),
+                 json.dumps(metadata) if metadata else None)
+            )
+        return True
+
+    def _release(self, url, worker_id, status, error):
+        """Move a URL the worker holds a lease on out of the leased state, returning False if it doesn't hold one"""
+        cursor = self.conn.execute("""
+            UPDATE jobs
+            SET status = CASE WHEN ? = 'pending' AND attempts >= ? THEN 'failed' ELSE ? END,
+                worker_id = NULL, lease_expires = NULL, error = ?
+            WHERE url = ? AND worker_id = ? AND status = 'leased'
+        """, (status, self.max_attempts, status, error, url, worker_id))
+        return cursor.rowcount == 1
+
+    def skip(self, url, worker_id, reason):
+        """Mark a URL as done without storing a result, if the worker still holds the lease"""
+        with self._transaction():
+            return self._release(url, worker_id, 'done', reason)
+
+    def fail(self, url, worker_id, error):
+        """Release a URL after an error, giving up once it has failed too often
+
+        Does nothing if the worker no longer holds the lease, so a late
+        failure can't put back a URL another worker has finished.
+        """
+        with self._transaction():
+            return self._release(url, worker_id, 'pending', str(error))
+
+    def stats(self):
+        """Return the number of URLs in each state"""
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        for status, count in self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+            counts[status] = count
+        return counts
+
+    def is_drained(self):
+        """Check whether every URL has either finished or failed for good"""
+        row = self.conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'leased')"
+        ).fetchone()
+        return row[0] == 0
+
+    def iter_results(self):
+        """Yield the stored articles in the same dict format the scraper produces"""
+        cursor = self.conn.execute(
+            "SELECT url, title, headings, content, timestamp, duplicate_of, metadata FROM results ORDER BY finished_at"
+        )
+        for url, title, headings, content, timestamp, duplicate_of, metadata in cursor:
+            # Content is stored compressed; databases from older versions hold plain text
+            if isinstance(content, bytes):
+                content = decompress_text(content)
+            article_data = {
+                'url': url,
+                'title': title,
+                'headings': json.loads(headings),
+                'content': content,
+                'timestamp': timestamp
+            }
+            if metadata:
+                article_data.update(json.loads(metadata))
+            if duplicate_of:
+                article_data['duplicate_of'] = duplicate_of
+            yield article_data
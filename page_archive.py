@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# ExcellentScraper - WARC capture of fetched pages and offline re-extraction
+
+import os
+import mmap
+import zlib
+import uuid
+import base64
+import socket
+import hashlib
+import sqlite3
+import datetime
+import threading
+import multiprocessing
+
+# HTTP headers that describe the transfer rather than the page; bodies are stored decoded, so these would lie
+_TRANSFER_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection', 'keep-alive'}
+
+# Pages handed to each re-extraction process at a time
+REEXTRACT_CHUNK = 64
+
+
+def _warc_date():
+    """Current time in the WARC-Date format"""
+    return datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _payload_digest(payload):
+    """SHA-1 digest of a payload in the base32 form WARC tools expect"""
+    return "sha1:" + base64.b32encode(hashlib.sha1(payload).digest()).decode('ascii')
+
+
+def _warc_record(warc_type, target_uri, content_type, block, payload=None):
+    """Serialize one WARC/1.1 record"""
+    headers = [
+        "WARC/1.1",
+        f"WARC-Type: {warc_type}",
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+        f"WARC-Date: {_warc_date()}",
+    ]
+    if target_uri:
+        headers.append(f"WARC-Target-URI: {target_uri}")
+    if payload is not None:
+        headers.append(f"WARC-Payload-Digest: {_payload_digest(payload)}")
+    headers.append(f"Content-Type: {content_type}")
+    headers.append(f"Content-Length: {len(block)}")
+    return ("\r\n".join(headers) + "\r\n\r\n").encode('utf-8') + block + b"\r\n\r\n"
+
+
+def _gzip_member(data):
+    """Compress data as a standalone gzip member, so each record can be read on its own"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _parse_headers(lines):
+    """Turn 'Name: value' lines into a list of (name, value) pairs"""
+    headers = []
+    for line in lines:
+        name, _, value = line.partition(':')
+        if name:
+            headers.append((name.strip(), value.strip()))
+    return headers
+
+
+class PageArchive:
+    """Directory of gzipped WARC files with a SQLite index by URL
+
+    Raw HTTP responses are stored as WARC response records and pages
+    rendered by Selenium as resource records. Every record is its own gzip
+    member, which is how standard .warc.gz files are laid out, so the
+    files open in common WARC tools and any record can be decompressed on
+    its own from its offset. Each process writes to a file of its own,
+    while the index is shared, so a worker fleet can capture into one
+    archive.
+    """
+
+    def __init__(self, path, writer_name=None):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.writer_name = writer_name or f"{socket.gethostname()}-{os.getpid()}"
+
+        self.conn = sqlite3.connect(os.path.join(path, "index.db"), timeout=60, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS captures (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                continuation INTEGER NOT NULL DEFAULT 0,
+                alias INTEGER NOT NULL DEFAULT 0,
+                file TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                captured_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS captures_url ON captures (url, kind);
+        """)
+
+        # Archives written by older versions lack the alias column
+        try:
+            self.conn.execute("ALTER TABLE captures ADD COLUMN alias INTEGER NOT NULL DEFAULT 0")
+        except sqlite3.OperationalError:
+            pass
+
+        # Pagination fetches pages from several threads at once
+        self._lock = threading.Lock()
+        self._file = None
+        self._file_name = None
+        self._maps = {}
+
+    def close(self):
+        """Close the archive file, its memory maps and the index"""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+            for mapped, handle in self._maps.values():
+                mapped.close()
+                handle.close()
+            self._maps = {}
+        self.conn.close()
+
+    def _append(self, url, alias, kind, continuation, record):
+        """Write one compressed record and index it under the URL it was fetched for, and its final URL as an alias"""
+        member = _gzip_member(record)
+        with self._lock:
+            if self._file is None:
+                self._file_name = f"{self.writer_name}.warc.gz"
+                self._file = open(os.path.join(self.path, self._file_name), 'ab')
+                if self._file.tell() == 0:
+                    info = b"software: ExcellentScraper\r\nformat: WARC File Format 1.1\r\n"
+                    self._file.write(_gzip_member(_warc_record("warcinfo", None, "application/warc-fields", info)))
+
+            offset = self._file.tell()
+            self._file.write(member)
+            self._file.flush()
+
+            now = datetime.datetime.now().timestamp()
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO captures (url, kind, continuation, alias, file, offset, length, captured_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(indexed_url, kind, int(continuation), int(indexed_url != url), self._file_name, offset,
+                      len(member), now)
+                     for indexed_url in dict.fromkeys([url, alias])]
+                )
+
+    def write_response(self, url, response, continuation=False):
+        """Capture an HTTP response fetched for url (indexed under its final URL too, after redirects)"""
+        body = response.content
+        head = [f"HTTP/1.1 {response.status_code} {response.reason or ''}".rstrip()]
+        head.extend(f"{name}: {value}" for name, value in response.headers.items()
+                    if name.lower() not in _TRANSFER_HEADERS)
+        head.append(f"Content-Length: {len(body)}")
+        block = ("\r\n".join(head) + "\r\n\r\n").encode('iso-8859-1', errors='replace') + body
+
+        record = _warc_record("response", response.url, "application/http; msgtype=response", block, body)
+        self._append(url, response.url, 'response', continuation, record)
+
+    def write_rendered(self, url, page_url, html):
+        """Capture the DOM Selenium rendered for url"""
+        block = html.encode('utf-8')
+        record = _warc_record("resource", page_url, "text/html; charset=utf-8", block, block)
+        self._append(url, page_url, 'rendered', False, record)
+
+    def _read(self, file_name, offset, length):
+        """Decompress one record through a memory map of its file, returning (headers, block)"""
+        with self._lock:
+            mapped = self._maps.get(file_name, (None,))[0]
+            if mapped is None or offset + length > len(mapped):
+                # Not mapped yet, or the file grew since it was mapped because it's still being written
+                if mapped is not None:
+                    old, handle = self._maps.pop(file_name)
+                    old.close()
+                    handle.close()
+                handle = open(os.path.join(self.path, file_name), 'rb')
+                mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps[file_name] = (mapped, handle)
+
+        record = zlib.decompress(mapped[offset:offset + length], 31)
+        head, _, rest = record.partition(b"\r\n\r\n")
+        headers = dict(_parse_headers(head.decode('utf-8').split("\r\n")[1:]))
+        return headers, rest[:int(headers.get('Content-Length', len(rest)))]
+
+    def _latest(self, url, kind):
+        """Index row of the newest capture of a URL, or None"""
+        return self.conn.execute(
+            "SELECT file, offset, length FROM captures WHERE url = ? AND kind = ? ORDER BY id DESC LIMIT 1", (url, kind)
+        ).fetchone()
+
+    def get_response(self, url):
+        """Rebuild the newest captured response for a URL as a requests Response, or None"""
+        import requests
+        from requests.structures import CaseInsensitiveDict
+        from requests.utils import get_encoding_from_headers
+
+        row = self._latest(url, 'response')
+        if row is None:
+            return None
+        warc_headers, block = self._read(*row)
+        head, _, body = block.partition(b"\r\n\r\n")
+        lines = head.decode('iso-8859-1').split("\r\n")
+        _, status, reason = (lines[0].split(' ', 2) + ['', ''])[:3]
+
+        response = requests.Response()
+        response.status_code = int(status)
+        response.reason = reason
+        response.url = warc_headers.get('WARC-Target-URI', url)
+        response.headers = CaseInsensitiveDict(_parse_headers(lines[1:]))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        return response
+
+    def get_rendered(self, url):
+        """Return (page URL, HTML) of the newest Selenium-rendered capture of a URL, or None"""
+        row = self._latest(url, 'rendered')
+        if row is None:
+            return None
+        warc_headers, block = self._read(*row)
+        return warc_headers.get('WARC-Target-URI', url), block.decode('utf-8')
+
+    def article_urls(self):
+        """Return every URL that was scraped as an article, in capture order
+
+        Final URLs after redirects are only aliases for looking captures
+        up, so a redirected page is listed once, under the URL it was
+        requested as.
+        """
+        return [url for url, in self.conn.execute(
+            "SELECT url FROM captures WHERE continuation = 0 AND alias = 0 GROUP BY url ORDER BY MIN(id)"
+        )]
+
+    def count(self):
+        """Return the number of captured records"""
+        return self.conn.execute("SELECT COUNT(DISTINCT file || ':' || offset) FROM captures").fetchone()[0]
+
+
+def _reextract_chunk(args):
+    """Re-run extraction on a chunk of archived URLs in a worker process"""
+    archive_path, urls = args
+    from scraper_core import ArticleScraper
+
+    archive = PageArchive(archive_path)
+    scraper = ArticleScraper(status_callback=lambda message: None)
+    scraper.offline_archive = archive
+    results = []
+    try:
+        for url in urls:
+            try:
+                results.append((url, scraper.scrape(url), None))
+            except Exception as e:
+                results.append((url, None, str(e)))
+    finally:
+        scraper.close()
+        archive.close()
+    return results
+
+
+def reextract(archive_path, processes=None):
+    """Re-extract every archived article, yielding (url, article_data or None, error or None)
+
+    Nothing is fetched: pages, their continuation pages and Selenium
+    renders all come from the archive, read through memory maps. The URLs
+    are split into chunks spread over a process pool, so the job scales
+    with the number of cores.
+    """
+    archive = PageArchive(archive_path)
+    try:
+        urls = archive.article_urls()
+    finally:
+        archive.close()
+
+    chunks = [(archive_path, urls[i:i + REEXTRACT_CHUNK]) for i in range(0, len(urls), REEXTRACT_CHUNK)]
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from _reextract_chunk(chunk)
+        return
+
+    with multiprocessing.Pool(processes) as pool:
+        for results in pool.imap(_reextract_chunk, chunks):
+            yield from results
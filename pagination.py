@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# ExcellentScraper - Detect multi-page articles and stitch their pages together
+
+import re
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Upper bound on the pages followed for one article, so a runaway pager can't eat a batch
+MAX_PAGES = 20
+
+# Query parameters sites commonly use for the page number
+PAGE_PARAMS = ('page', 'p', 'pg', 'paged', 'pagenum', 'page_num', 'seite', 'pagina')
+
+# "Page 2 of 5", "page 2 / 5"
+PAGE_OF_RE = re.compile(r'\bpage\s+(\d{1,3})\s*(?:of|/)\s*(\d{1,3})\b', re.IGNORECASE)
+
+# /page/2, /2 or -2 at the end of the path, before any .html-style extension
+_PATH_PAGE_RE = re.compile(r'(?:/page/|/|-)(\d{1,3})(\.[a-z]{2,5})?/?$', re.IGNORECASE)
+
+# Words used on "next page" links
+_NEXT_WORDS = ('next', 'next page', 'continue', 'continue reading', '›', '»', '>', '→')
+
+# Paragraphs that are only pager chrome ("Page 2 of 5", "1 2 3 Next »")
+_PAGER_TEXT_RE = re.compile(
+    r'^(?:page\s+\d+\s*(?:of|/)\s*\d+|(?:previous|prev|next)(?:\s+page)?|[\d\s|.,«»‹›<>→←-]+)$', re.IGNORECASE
+)
+
+
+def _normalize(url):
+    """Drop the fragment and trailing slash so URLs of one page compare equal"""
+    scheme, netloc, path, query, _ = urlsplit(url)
+    return urlunsplit((scheme, netloc.lower(), path.rstrip('/'), query, ''))
+
+
+def split_page_url(url):
+    """Split a URL into (url without its page number, page number), or None if it has none
+
+    Recognizes page numbers in a query parameter (?page=3), a /page/3
+    segment, or a trailing /3 or -3 on the path (story-3.html).
+    """
+    scheme, netloc, path, query, _ = urlsplit(url)
+    params = parse_qsl(query, keep_blank_values=True)
+    for i, (name, value) in enumerate(params):
+        if name.lower() in PAGE_PARAMS and value.isdigit():
+            rest = urlencode(params[:i] + params[i + 1:])
+            return urlunsplit((scheme, netloc.lower(), path.rstrip('/'), rest, '')), int(value)
+
+    match = _PATH_PAGE_RE.search(path)
+    if match:
+        base_path = path[:match.start()].rstrip('/') + (match.group(2) or '')
+        return urlunsplit((scheme, netloc.lower(), base_path, query, '')), int(match.group(1))
+    return None
+
+
+def _looks_like_pager_link(anchor):
+    """Check whether a link sits in a pager or reads like one"""
+    text = anchor.get_text(strip=True).lower()
+    if text.isdigit() or text in _NEXT_WORDS:
+        return True
+    parent = anchor.parent
+    for _ in range(4):
+        if parent is None:
+            break
+        marker = ' '.join(parent.get('class') or []) + ' ' + (parent.get('id') or '')
+        if 'pag' in marker.lower():
+            return True
+        parent = parent.parent
+    return False
+
+
+def find_page_urls(soup, url):
+    """Return [(page number, url)] for the later pages of a paginated article
+
+    Candidates come from rel="next" links and from links in the page's
+    pager. A candidate only counts if it is this URL with a different page
+    number, which rules out "next article" links. When the page says
+    "Page 1 of 5" but its pager only links a few pages, the missing ones
+    are filled in from the pattern of the links that are there, so every
+    page can be fetched at once instead of one rel="next" hop at a time.
+    """
+    # The article URL may or may not carry a page number itself (/story/123 is usually an ID)
+    bases = {_normalize(url): 1}
+    own = split_page_url(url)
+    if own:
+        bases.setdefault(own[0], own[1])
+
+    pages = {}
+    pattern = None
+    for element in soup.find_all(['a', 'link'], href=True):
+        rel = element.get('rel') or []
+        if 'next' not in rel and (element.name == 'link' or not _looks_like_pager_link(element)):
+            continue
+
+        target = urljoin(url, element['href'].strip())
+        split = split_page_url(target)
+        if split is None or split[0] not in bases:
+            continue
+
+        base, number = split
+        if bases[base] < number <= MAX_PAGES:
+            pages[number] = target
+            pattern = (base, target, number)
+
+    if pattern:
+        # Build the pages the pager skipped ("1 2 3 ... 9") from a link we did see
+        base, example_url, example_number = pattern
+        current = bases[base]
+        last = max(pages)
+        match = PAGE_OF_RE.search(soup.get_text(' ', strip=True))
+        if match and int(match.group(1)) <= current:
+            last = max(last, min(int(match.group(2)), MAX_PAGES))
+        for number in range(current + 1, last + 1):
+            if number not in pages:
+                pages[number] = _with_page_number(example_url, example_number, number)
+
+    return sorted(pages.items())
+
+
+def _with_page_number(example_url, example_number, number):
+    """Rewrite the page number in a URL known to hold example_number"""
+    scheme, netloc, path, query, fragment = urlsplit(example_url)
+    params = parse_qsl(query, keep_blank_values=True)
+    for i, (name, value) in enumerate(params):
+        if name.lower() in PAGE_PARAMS and value == str(example_number):
+            params[i] = (name, str(number))
+            return urlunsplit((scheme, netloc, path, urlencode(params), fragment))
+
+    match = _PATH_PAGE_RE.search(path)
+    path = path[:match.start(1)] + str(number) + path[match.end(1):]
+    return urlunsplit((scheme, netloc, path, query, fragment))
+
+
+def stitch_pages(pages):
+    """Merge [(headings, content)] from consecutive pages into one (headings, content)
+
+    Headings keep their page order with repeats (the title, section names
+    in the site chrome) dropped. Paragraphs that already appeared on an
+    earlier page are boilerplate such as bylines, share prompts or
+    newsletter boxes, so only their first occurrence is kept. Pager
+    leftovers like "Page 2 of 5" are dropped.
+    """
+    headings = []
+    seen_headings = set()
+    paragraphs = []
+    seen_paragraphs = set()
+
+    for page_headings, content in pages:
+        for heading in page_headings:
+            if heading not in seen_headings:
+                seen_headings.add(heading)
+                headings.append(heading)
+
+        if not content or content == "No content found":
+            continue
+        for paragraph in content.split("\n\n"):
+            key = ' '.join(paragraph.split()).lower()
+            if not key or key in seen_paragraphs or _PAGER_TEXT_RE.match(key):
+                continue
+            seen_paragraphs.add(key)
+            paragraphs.append(paragraph.strip())
+
+    return headings, "\n\n".join(paragraphs) if paragraphs else "No content found"
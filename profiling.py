@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# ExcellentScraper - Optional tracing spans, cProfile and tracemalloc for slow batches
+
+import io
+import os
+import json
+import time
+import pstats
+import cProfile
+import threading
+import contextlib
+import tracemalloc
+
+
+class Profiler:
+    """Collects timing spans for each pipeline stage while profiling is on
+
+    Spans are written as a Chrome trace-event file, which opens in
+    chrome://tracing or https://ui.perfetto.dev, together with a plain
+    text summary of the slowest stages, URLs, functions and allocation
+    sites that can be pasted straight into a bug report.
+    """
+
+    def __init__(self, use_cprofile=False, use_tracemalloc=False, top_n=25):
+        self.use_cprofile = use_cprofile
+        self.use_tracemalloc = use_tracemalloc
+        self.top_n = top_n
+        self.events = []
+        self.thread_names = {}
+        self.stats = None
+        self.pid = os.getpid()
+        self.started = time.perf_counter()
+
+        if use_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+
+    def _now_us(self):
+        """Microseconds since profiling started"""
+        return (time.perf_counter() - self.started) * 1_000_000
+
+    @contextlib.contextmanager
+    def span(self, name, **args):
+        """Time a block of code as one span"""
+        thread = threading.current_thread()
+        self.thread_names.setdefault(thread.ident, thread.name)
+        start = self._now_us()
+        try:
+            yield args
+        finally:
+            # list.append is atomic, so spans from several threads can be recorded without a lock
+            self.events.append({
+                'name': name,
+                'cat': 'stage',
+                'ph': 'X',
+                'ts': start,
+                'dur': self._now_us() - start,
+                'pid': self.pid,
+                'tid': thread.ident,
+                'args': {key: str(value) for key, value in args.items()}
+            })
+
+    @contextlib.contextmanager
+    def profile_url(self, url):
+        """Wrap the whole scrape of one URL, with cProfile and tracemalloc if enabled"""
+        profile = cProfile.Profile() if self.use_cprofile else None
+        if self.use_tracemalloc:
+            tracemalloc.reset_peak()
+
+        with self.span('scrape_url', url=url) as args:
+            if profile:
+                profile.enable()
+            try:
+                yield
+            finally:
+                if profile:
+                    profile.disable()
+                if self.use_tracemalloc:
+                    current, peak = tracemalloc.get_traced_memory()
+                    args['peak_kb'] = peak // 1024
+
+        if profile:
+            if self.stats is None:
+                self.stats = pstats.Stats(profile)
+            else:
+                self.stats.add(profile)
+
+    def write(self, path_prefix):
+        """Write <prefix>.trace.json and <prefix>.summary.txt, returning both paths"""
+        os.makedirs(os.path.dirname(path_prefix) or ".", exist_ok=True)
+
+        trace_path = path_prefix + ".trace.json"
+        metadata = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid, 'args': {'name': name}}
+            for tid, name in self.thread_names.items()
+        ]
+        with open(trace_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': metadata + self.events, 'displayTimeUnit': 'ms'}, f)
+
+        summary_path = path_prefix + ".summary.txt"
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(self.summary())
+
+        if self.use_tracemalloc:
+            tracemalloc.stop()
+
+        return trace_path, summary_path
+
+    def summary(self):
+        """Build the text report of the hottest stages, URLs, functions and allocations"""
+        out = io.StringIO()
+        wall_ms = self._now_us() / 1000
+
+        # Time per stage
+        stages = {}
+        for event in self.events:
+            stage = stages.setdefault(event['name'], [0, 0.0, 0.0])
+            stage[0] += 1
+            stage[1] += event['dur'] / 1000
+            stage[2] = max(stage[2], event['dur'] / 1000)
+
+        out.write(f"Profiled {wall_ms / 1000:.2f} s of wall time\n\n")
+        out.write("Stages by total time (spans nest, so totals overlap)\n")
+        out.write(f"{'stage':<24}{'count':>8}{'total ms':>12}{'mean ms':>10}{'max ms':>10}{'% wall':>8}\n")
+        for name, (count, total, longest) in sorted(stages.items(), key=lambda item: -item[1][1])[:self.top_n]:
+            out.write(f"{name:<24}{count:>8}{total:>12.1f}{total / count:>10.1f}{longest:>10.1f}{total / wall_ms * 100 if wall_ms else 0:>8.1f}\n")
+
+        # Slowest URLs
+        urls = sorted((event for event in self.events if event['name'] == 'scrape_url'), key=lambda event: -event['dur'])
+        if urls:
+            out.write("\nSlowest URLs\n")
+            for event in urls[:self.top_n]:
+                peak = f"  peak {event['args']['peak_kb']} KB" if 'peak_kb' in event['args'] else ""
+                out.write(f"{event['dur'] / 1000:>10.1f} ms  {event['args'].get('url', '')}{peak}\n")
+
+        # cProfile hotspots
+        if self.stats is not None:
+            out.write(f"\nTop {self.top_n} functions by own time (cProfile)\n")
+            self.stats.stream = out
+            self.stats.sort_stats('tottime').print_stats(self.top_n)
+
+        # tracemalloc hotspots
+        if self.use_tracemalloc and tracemalloc.is_tracing():
+            out.write(f"\nTop {self.top_n} allocation sites still held (tracemalloc)\n")
+            for stat in tracemalloc.take_snapshot().statistics('lineno')[:self.top_n]:
+                out.write(f"{stat.size / 1024:>10.1f} KB  {stat.count:>8} blocks  {stat.traceback[0]}\n")
+
+        return out.getvalue()
+
+
+class _NullProfiler:
+    """Stand-in used while profiling is off, so spans cost one function call"""
+
+    _null = contextlib.nullcontext()
+
+    def span(self, name, **args):
+        # A dict of its own per span: callers record details into it, from several threads at once
+        return contextlib.nullcontext({})
+
+    def profile_url(self, url):
+        return self._null
+
+
+_profiler = _NullProfiler()
+
+
+def span(name, **args):
+    """Time a pipeline stage, if profiling is on"""
+    return _profiler.span(name, **args)
+
+
+def profile_url(url):
+    """Time the scrape of one URL, if profiling is on"""
+    return _profiler.profile_url(url)
+
+
+def start_profiling(use_cprofile=False, use_tracemalloc=False, top_n=25):
+    """Turn profiling on for this process and return the new Profiler"""
+    global _profiler
+    _profiler = Profiler(use_cprofile=use_cprofile, use_tracemalloc=use_tracemalloc, top_n=top_n)
+    return _profiler
+
+
+def stop_profiling():
+    """Turn profiling off and return the Profiler that was collecting, if any"""
+    global _profiler
+    profiler, _profiler = _profiler, _NullProfiler()
+    return profiler if isinstance(profiler, Profiler) else None
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# ExcellentScraper - Compact article records with compressed, file-backed bodies
+
+import os
+import sys
+import json
+import zlib
+import datetime
+import tempfile
+import threading
+from urllib.parse import urlsplit
+
+# zstd compresses article text better and faster than zlib, but is optional
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CODEC_ZLIB = b'z'
+CODEC_ZSTD = b's'
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Optional article fields taken from structured data, when the page has them
+METADATA_KEYS = ('author', 'date_published', 'date_modified')
+
+
+def compress_text(text):
+    """Compress a string, prefixed with a one-byte codec marker"""
+    data = text.encode('utf-8')
+    if zstandard is not None:
+        return CODEC_ZSTD + zstandard.ZstdCompressor(level=3).compress(data)
+    return CODEC_ZLIB + zlib.compress(data, 6)
+
+
+def decompress_text(blob):
+    """Reverse compress_text"""
+    codec, data = blob[:1], blob[1:]
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("This data was compressed with zstd; install the zstandard package to read it")
+        return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+    return zlib.decompress(data).decode('utf-8')
+
+
+class BlobStore:
+    """Append-only file of compressed article bodies, addressed by offset
+
+    Writes only ever go to the end of the file and reads use positional
+    reads, so one store can be read from several threads while the
+    scraping thread keeps appending. With no path, a temporary file is
+    used and removed when the store is closed.
+    """
+
+    def __init__(self, path=None):
+        self.temporary = path is None
+        if self.temporary:
+            fd, path = tempfile.mkstemp(prefix="excellentscraper_", suffix=".blob")
+            os.close(fd)
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'ab')
+        self._fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+
+    def append(self, text):
+        """Store a string and return its (offset, length) reference"""
+        blob = compress_text(text)
+        with self._lock:
+            offset = self._file.seek(0, os.SEEK_END)
+            self._file.write(blob)
+            self._file.flush()
+        return offset, len(blob)
+
+    def read(self, offset, length):
+        """Load the string stored at a reference"""
+        if hasattr(os, 'pread'):
+            blob = os.pread(self._fd, length, offset)
+        else:
+            # Windows has no pread, so fall back to a locked seek and read
+            with self._lock:
+                os.lseek(self._fd, offset, os.SEEK_SET)
+                blob = os.read(self._fd, length)
+        return decompress_text(blob)
+
+    def close(self):
+        """Close the store, deleting it if it was temporary"""
+        self._file.close()
+        os.close(self._fd)
+        _open_stores.pop(self.path, None)
+        if self.temporary and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# Stores opened in this process, by path, so records can find their bodies after being pickled
+_open_stores = {}
+
+
+def open_blob_store(path=None):
+    """Open a blob store, or return the one already open at that path"""
+    if path is not None and path in _open_stores:
+        return _open_stores[path]
+    store = BlobStore(path)
+    _open_stores[store.path] = store
+    return store
+
+
+class ArticleRecord:
+    """A scraped article that keeps only small fields in memory
+
+    The headings and content are compressed into a BlobStore and loaded
+    on demand, the domain is interned so thousands of articles from one
+    site share a single string, and the timestamp is an epoch float.
+    A pickled record is just a handful of short fields plus the blob
+    file's path, so it is cheap to send to another process on the same
+    machine. Records also answer record['content'] and the other keys
+    of the scraper's dicts, so code written for dicts keeps working.
+    """
+
+    __slots__ = ('url', 'domain', 'title', 'scraped_at', 'heading_count', 'blob_path', 'blob_offset', 'blob_length',
+                 'duplicate_of', 'metadata_keys')
+
+    def __init__(self, url, title, scraped_at, heading_count, blob_path, blob_offset, blob_length, duplicate_of=None,
+                 metadata_keys=()):
+        self.url = url
+        self.domain = sys.intern(urlsplit(url).netloc.lower())
+        self.title = title
+        self.scraped_at = scraped_at
+        self.heading_count = heading_count
+        self.blob_path = blob_path
+        self.blob_offset = blob_offset
+        self.blob_length = blob_length
+        # URL of the earlier article this one is a near-duplicate of, if flagged
+        self.duplicate_of = duplicate_of
+        # Which of METADATA_KEYS the blob holds, so exports can pick columns without reading bodies
+        self.metadata_keys = metadata_keys
+
+    @classmethod
+    def from_article(cls, article_data, blob_store):
+        """Build a record from a scraper dict, moving its body into the blob store"""
+        try:
+            scraped_at = datetime.datetime.strptime(article_data['timestamp'], TIMESTAMP_FORMAT).timestamp()
+        except (KeyError, ValueError):
+            scraped_at = datetime.datetime.now().timestamp()
+
+        # Remember the store so records can find it again by path
+        _open_stores.setdefault(blob_store.path, blob_store)
+
+        headings = article_data['headings']
+        body = [headings, article_data['content']]
+        metadata = {key: article_data[key] for key in METADATA_KEYS if article_data.get(key)}
+        if metadata:
+            body.append(metadata)
+        offset, length = blob_store.append(json.dumps(body, ensure_ascii=False))
+        return cls(article_data['url'], article_data['title'], scraped_at, len(headings),
+                   blob_store.path, offset, length, article_data.get('duplicate_of'), tuple(metadata))
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+        self.domain = sys.intern(self.domain)
+
+    def _load_body(self):
+        """Read (headings, content, metadata) back from the blob store"""
+        body = json.loads(open_blob_store(self.blob_path).read(self.blob_offset, self.blob_length))
+        return body[0], body[1], body[2] if len(body) > 2 else {}
+
+    @property
+    def headings(self):
+        return self._load_body()[0]
+
+    @property
+    def content(self):
+        return self._load_body()[1]
+
+    @property
+    def timestamp(self):
+        return datetime.datetime.fromtimestamp(self.scraped_at).strftime(TIMESTAMP_FORMAT)
+
+    def to_dict(self):
+        """Expand the record back into the scraper's dict format"""
+        headings, content, metadata = self._load_body()
+        article_data = {
+            'url': self.url,
+            'title': self.title,
+            'headings': headings,
+            'content': content,
+            'timestamp': self.timestamp
+        }
+        article_data.update(metadata)
+        if self.duplicate_of:
+            article_data['duplicate_of'] = self.duplicate_of
+        return article_data
+
+    def __getitem__(self, key):
+        if key == 'duplicate_of' and self.duplicate_of:
+            return self.duplicate_of
+        if key in self.metadata_keys:
+            return self._load_body()[2][key]
+        if key not in ('url', 'title', 'headings', 'content', 'timestamp'):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return f"ArticleRecord({self.url!r}, {self.title!r})"
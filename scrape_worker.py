@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# ExcellentScraper - Headless workers that drain a shared job queue
+
+import os
+import time
+import socket
+import datetime
+import threading
+import multiprocessing
+from job_queue import JobQueue
+from dedup_index import DuplicateIndex
+from scraper_core import ArticleScraper, RateLimiter
+from page_archive import PageArchive
+from profiling import span, profile_url, start_profiling, stop_profiling
+
+
+def _log(worker_id, message):
+    """Print a timestamped status line tagged with the worker id"""
+    current_time = datetime.datetime.now().strftime("%H:%M:%S")
+    print(f"[{current_time}] [{worker_id}] {message}", flush=True)
+
+
+def _heartbeat_loop(queue_path, worker_id, stop_event):
+    """Keep the worker's leases alive until told to stop"""
+    # SQLite connections can't be shared between threads, so open our own
+    job_queue = JobQueue(queue_path)
+    interval = max(1.0, job_queue.lease_seconds / 3)
+    try:
+        while not stop_event.wait(interval):
+            job_queue.heartbeat(worker_id)
+    finally:
+        job_queue.close()
+
+
+def run_worker(queue_path, worker_id=None, domain_delay=1.0, duplicates="drop", dedup_path=None,
+               poll_interval=0.25, exit_when_drained=True, profile_dir=None, use_cprofile=False,
+               use_tracemalloc=False, archive_path=None):
+    """Claim URLs from the queue and scrape them until the queue is drained
+
+    With a profile_dir, the worker records per-stage spans (and optionally
+    cProfile and tracemalloc data) and writes its own trace and summary
+    there when it finishes. With an archive_path, every page it fetches is
+    captured to its own WARC file in that shared archive.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    if profile_dir:
+        start_profiling(use_cprofile=use_cprofile, use_tracemalloc=use_tracemalloc)
+    job_queue = JobQueue(queue_path, domain_delay=domain_delay)
+    scraper = ArticleScraper(status_callback=lambda message: _log(worker_id, message))
+    # Continuation pages of multi-page articles are fetched by this worker, so space them out the same way
+    scraper.rate_limiter = RateLimiter(domain_delay)
+    scraper.archive = PageArchive(archive_path, writer_name=worker_id) if archive_path else None
+
+    # All workers share one duplicate index, so a copy is caught whichever worker scraped the original
+    dedup_index = DuplicateIndex(dedup_path or queue_path + ".dedup") if duplicates != "keep" else None
+
+    # Start the heartbeat thread
+    stop_event = threading.Event()
+    threading.Thread(target=_heartbeat_loop, args=(queue_path, worker_id, stop_event), daemon=True).start()
+
+    _log(worker_id, "Worker started")
+    scraped = 0
+    try:
+        while True:
+            url = job_queue.claim(worker_id)
+            if url is None:
+                if exit_when_drained and job_queue.is_drained():
+                    break
+                # Either everything left is leased by other workers or its domain is cooling down
+                time.sleep(poll_interval)
+                continue
+
+            try:
+                with profile_url(url):
+                    article_data = scraper.scrape(url)
+
+                    with span("dedupe"):
+                        duplicate_of = dedup_index.check_and_add(url, article_data['content']) if dedup_index else None
+                    if duplicate_of and duplicates == "drop":
+                        _log(worker_id, f"Skipping near-duplicate of {duplicate_of}: {url}")
+                        job_queue.skip(url, worker_id, f"Duplicate of {duplicate_of}")
+                        continue
+                    if duplicate_of:
+                        article_data['duplicate_of'] = duplicate_of
+
+                    with span("store_result"):
+                        stored = job_queue.complete(url, worker_id, article_data)
+                if not stored:
+                    # The lease ran out and the URL was handed to another worker, whose result counts instead
+                    _log(worker_id, f"Lease on {url} expired, discarding the late result")
+                    continue
+                scraped += 1
+            except Exception as e:
+                _log(worker_id, f"Error scraping {url}: {str(e)}")
+                job_queue.fail(url, worker_id, e)
+    finally:
+        stop_event.set()
+        scraper.close()
+        job_queue.close()
+        if scraper.archive:
+            scraper.archive.close()
+        if dedup_index:
+            dedup_index.close()
+
+        profiler = stop_profiling()
+        if profiler:
+            trace_path, summary_path = profiler.write(os.path.join(profile_dir, f"profile_{worker_id}"))
+            _log(worker_id, f"Profile written to {trace_path} and {summary_path}")
+
+    _log(worker_id, f"Worker finished after scraping {scraped} URLs")
+    return scraped
+
+
+def run_fleet(queue_path, processes, domain_delay=1.0, duplicates="drop", dedup_path=None, profile_dir=None,
+              use_cprofile=False, use_tracemalloc=False, archive_path=None):
+    """Run several worker processes against the same queue and wait for them"""
+    workers = []
+    for _ in range(processes):
+        process = multiprocessing.Process(
+            target=run_worker, args=(queue_path,),
+            kwargs={'domain_delay': domain_delay, 'duplicates': duplicates, 'dedup_path': dedup_path,
+                    'profile_dir': profile_dir, 'use_cprofile': use_cprofile, 'use_tracemalloc': use_tracemalloc,
+                    'archive_path': archive_path}
+        )
+        process.start()
+        workers.append(process)
+
+    for process in workers:
+        process.join()
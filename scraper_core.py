@@ -0,0 +1,771 @@
+#!/usr/bin/env python3
+# ExcellentScraper - Scraping pipeline shared by the GUI and headless workers
+
+import os
+import re
+import codecs
+import time
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
+import requests
+from profiling import span
+from html_parsers import choose_backend, parse_html, strip_noise
+from pagination import MAX_PAGES, find_page_urls, stitch_pages
+from structured_data import (find_json_ld_article, scan_headings, scan_links, has_next_page,
+                             microdata_article_body, microdata_details)
+from hydration_state import find_hydrated_article
+
+# Selenium, webdriver_manager and openpyxl are slow to import and only needed for
+# the browser fallback and Excel export, so they are imported where they're used
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Pragma': 'no-cache',
+    'Cache-Control': 'no-cache',
+}
+
+# Export columns for the optional structured-data fields
+METADATA_COLUMNS = [('author', 'Author'), ('date_published', 'Published'), ('date_modified', 'Modified')]
+
+# Record keys and column names for what changed since the last check of a watched page
+CHANGE_COLUMNS = [('change', 'Change'), ('headings_diff', 'Headings Diff'), ('content_diff', 'Content Diff')]
+
+# Continuation pages of a multi-page article fetched at the same time
+PAGE_WORKERS = 6
+
+
+class RateLimiter:
+    """Spaces out the start of requests to each host, across threads
+
+    Each request reserves the next free slot for its host and sleeps until
+    then, so a burst of page fetches reaches the server as a short,
+    evenly spaced stream rather than all at once.
+    """
+
+    def __init__(self, min_interval=0.2):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_allowed = {}
+
+    def wait(self, url):
+        """Block until a request to this URL's host may start"""
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(host, 0.0))
+            self._next_allowed[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _is_content_heading(text):
+    """Check that a heading is real article text rather than navigation"""
+    if not text or len(text) <= 3:  # Filter out very short or empty headings
+        return False
+    # Check if heading isn't just navigation or generic text
+    return not any(nav_word in text.lower() for nav_word in ['menu', 'navigation', 'search', 'login', 'sign in'])
+
+
+class ArticleScraper:
+    """Fetch and extract article content without any GUI dependencies"""
+
+    def __init__(self, status_callback=None):
+        # Where progress messages go (the GUI log, or stdout for workers)
+        self.status_callback = status_callback or print
+
+        # Initialize webdriver lazily only when needed
+        self.driver = None
+
+        # Whether to include the page's outgoing links in each record (used for crawling)
+        self.collect_links = False
+
+        # Whether to fetch and stitch the later pages of multi-page articles
+        self.follow_pagination = True
+
+        # Parser backend name from html_parsers ("lxml", "html5lib", ...), or None to pick one per page
+        self.parser_backend = None
+
+        # PageArchive to capture every fetched response and rendered page into, if any
+        self.archive = None
+
+        # PageArchive to read pages from instead of the network, for re-extraction
+        self.offline_archive = None
+
+        # One keep-alive session and rate limiter for every request, including parallel page fetches
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        self.session.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=PAGE_WORKERS))
+        self.session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=PAGE_WORKERS))
+        self.rate_limiter = RateLimiter()
+
+    def _update_status(self, message):
+        """Report a progress message"""
+        self.status_callback(message)
+
+    def scrape(self, url, response=None):
+        """Scrape a URL with BeautifulSoup, falling back to Selenium
+
+        A response already fetched for the URL (see fetch_if_modified) is
+        used instead of downloading the page again.
+        """
+        # First try with requests and BeautifulSoup
+        try:
+            article_data = self._scrape_with_beautifulsoup(url, response)
+            self._update_status(f"Successfully scraped with BeautifulSoup: {url}")
+        except Exception as bs_error:
+            if self.offline_archive is not None:
+                # Re-extracting: use the page Selenium rendered when it was captured, if there is one
+                rendered = self.offline_archive.get_rendered(url)
+                if rendered is None:
+                    raise
+                page_url, page_source = rendered
+                return self._extract_rendered(url, page_source, page_url)
+
+            self._update_status(f"BeautifulSoup failed for {url}, trying Selenium: {str(bs_error)}")
+
+            # Initialize Selenium if not already done
+            if self.driver is None:
+                with span("selenium_start"):
+                    self.driver = self._create_driver()
+
+            # Try with Selenium
+            article_data = self._scrape_with_selenium(self.driver, url)
+            self._update_status(f"Successfully scraped with Selenium: {url}")
+
+        return article_data
+
+    def _create_driver(self):
+        """Start a headless Chrome WebDriver"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        self._update_status("Initializing Selenium WebDriver...")
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+
+    def close(self):
+        """Close the HTTP session, and the driver if it was initialized"""
+        self.session.close()
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+            self._update_status("Closed Selenium WebDriver")
+
+    def fetch_if_modified(self, url, etag=None, last_modified=None):
+        """Download a page with a conditional request, returning None if the server says it hasn't changed"""
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return self._fetch(url, headers=headers)
+
+    def _fetch(self, url, continuation=False, headers=None):
+        """Download a page through the shared session and rate limiter, or None for a 304 Not Modified"""
+        if self.offline_archive is not None:
+            response = self.offline_archive.get_response(url)
+            if response is None:
+                raise ValueError(f"Not in the archive: {url}")
+            return response
+
+        self.rate_limiter.wait(url)
+        with span("fetch", url=url) as span_args:
+            response = self.session.get(url, timeout=30, headers=headers)
+            if response.status_code == 304:
+                span_args['not_modified'] = True
+                return None
+            response.raise_for_status()
+            span_args['bytes'] = len(response.content)
+
+        if self.archive is not None:
+            with span("archive"):
+                self.archive.write_response(url, response, continuation)
+        return response
+
+    def _fetch_soup(self, url):
+        """Download a continuation page and parse it, returning (response, soup)"""
+        response = self._fetch(url, continuation=True)
+        return response, self._parse_response(response)
+
+    def _parse_response(self, response):
+        """Decode a response and parse it into a soup"""
+        # Try to detect encoding, defaulting to UTF-8
+        with span("detect_encoding"):
+            if response.encoding is None or response.encoding == 'ISO-8859-1':
+                # Requests sometimes incorrectly detects ISO-8859-1
+                possible_encoding = response.apparent_encoding
+                if possible_encoding and possible_encoding.lower() != 'iso-8859-1':
+                    response.encoding = possible_encoding
+            html = response.text
+
+        return self._parse_html(html)
+
+    def _parse_html(self, html, source="requests"):
+        """Parse a document once, with the forced backend or the one its markup suggests"""
+        # Noise is cut out before the backend is picked, so scripts and templates don't skew the sniff
+        with span("strip_noise", source=source):
+            html = strip_noise(html)
+        backend = self.parser_backend or choose_backend(html)
+        with span(f"parse_{backend}", source=source):
+            soup, _ = parse_html(html, backend, stripped=True)
+        return soup
+
+    def _scrape_structured_data(self, response, url):
+        """Build the article from its JSON-LD or app state alone, without parsing the page, or return None
+
+        Only the JSON-LD scripts or framework state (Next.js, Nuxt, Redux,
+        Apollo), headings and (when crawling) links are pulled out of the
+        raw bytes. Multi-page articles take the normal path, since their
+        embedded data often holds just the first page.
+        """
+        raw = response.content
+        if self.follow_pagination and has_next_page(raw):
+            return None
+
+        # Skip the costly charset sniffing; JSON-LD is nearly always UTF-8 when no charset is declared
+        encoding = response.encoding if response.encoding and response.encoding.lower() != 'iso-8859-1' else None
+        if encoding:
+            # A charset Python doesn't know (such as "utf8mb4") is treated as undeclared, as requests does for .text
+            try:
+                codecs.lookup(encoding)
+            except LookupError:
+                encoding = None
+        with span("json_ld"):
+            article = find_json_ld_article(raw, encoding)
+        if article is None:
+            # Single-page apps ship their article in the state they hydrate from
+            with span("app_state"):
+                article = find_hydrated_article(raw, encoding, response.url)
+        if article is None:
+            return None
+
+        headings = article.get('headings') or scan_headings(raw, encoding)
+        headings = [text for text in headings if _is_content_heading(text)] or [article['title']]
+        article_data = {
+            'url': url,
+            'title': article['title'],
+            'headings': headings,
+            'content': article['content'],
+            'timestamp': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        for key in ('author', 'date_published', 'date_modified'):
+            if article[key]:
+                article_data[key] = article[key]
+        if self.collect_links:
+            with span("extract_links"):
+                article_data['links'] = scan_links(raw, response.url, encoding)
+        return article_data
+
+    def _scrape_with_beautifulsoup(self, url, response=None):
+        """Scrape a URL using requests and BeautifulSoup"""
+        if response is None:
+            response = self._fetch(url)
+
+        # Fast path: publishers that embed the full article as JSON-LD don't need the DOM at all
+        article_data = self._scrape_structured_data(response, url)
+        if article_data:
+            self._update_status(f"Read article from its embedded data: {url}")
+            return article_data
+
+        soup = self._parse_response(response)
+
+        # Collect links and pagination before content extraction starts removing elements
+        with span("extract_links"):
+            links = self._extract_links(soup, response.url) if self.collect_links else None
+        page_urls = find_page_urls(soup, response.url) if self.follow_pagination else []
+
+        # Extract the title
+        with span("extract_title"):
+            title = self._extract_title(soup)
+
+        # Extract headings (improved filtering)
+        with span("extract_headings"):
+            headings = self._extract_headings(soup, title)
+
+        # Extract the main content, preferring a microdata articleBody over the heuristics
+        with span("extract_content"):
+            details = microdata_details(soup)
+            content = microdata_article_body(soup) or self._extract_article_content(soup)
+
+        # Nothing in the static HTML or its embedded data, so it's rendered by JavaScript: let Selenium try
+        if content == "No content found":
+            raise ValueError("No article content in the static HTML")
+
+        # Multi-page article: fetch the remaining pages and merge them into this record
+        if page_urls:
+            headings, content, fetched = self._stitch_continuation_pages(response.url, headings, content, page_urls)
+            if links is not None:
+                # The crawler shouldn't scrape the continuation pages again as articles of their own
+                links = [link for link in links if link not in fetched]
+
+        # Return the data
+        article_data = {
+            'url': url,
+            'title': title,
+            'headings': headings,
+            'content': content,
+            'timestamp': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        article_data.update(details)
+        if links is not None:
+            article_data['links'] = links
+        return article_data
+
+    def _scrape_with_selenium(self, driver, url):
+        """Scrape a URL using Selenium"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        with span("selenium_get", url=url):
+            driver.get(url)
+
+        # Wait for the page to load (increased timeout and better detection)
+        with span("selenium_wait"):
+            try:
+                # First wait for body to exist
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
+
+                # Then wait for content to load - try common article content selectors
+                content_selectors = [
+                    "article",
+                    ".article",
+                    ".post",
+                    ".content",
+                    ".entry-content",
+                    ".article-content",
+                    "#content",
+                    ".main-content"
+                ]
+
+                # Try each selector for a short time
+                for selector in content_selectors:
+                    try:
+                        WebDriverWait(driver, 5).until(
+                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+                        )
+                        self._update_status(f"Found content using selector: {selector}")
+                        break
+                    except:
+                        continue
+
+                # As a fallback, just wait a bit for any dynamic content to load
+                # This helps with JavaScript-heavy sites
+                time.sleep(2)
+
+            except Exception as e:
+                self._update_status(f"Warning: Timeout waiting for page to fully load: {str(e)}")
+
+        # Extract the title
+        title = driver.title
+
+        page_source = driver.page_source
+        if self.archive is not None:
+            with span("archive"):
+                self.archive.write_rendered(url, driver.current_url, page_source)
+
+        return self._extract_rendered(url, page_source, driver.current_url, title)
+
+    def _extract_rendered(self, url, page_source, page_url, title=None):
+        """Extract an article from a page rendered by Selenium, live or from the archive"""
+        # Get the page source and parse it with BeautifulSoup
+        soup = self._parse_html(page_source, source="selenium")
+        if title is None:
+            title = soup.title.get_text(strip=True) if soup.title else ""
+
+        # Collect links before content extraction starts removing elements
+        with span("extract_links"):
+            links = self._extract_links(soup, page_url) if self.collect_links else None
+
+        # Extract headings
+        with span("extract_headings"):
+            headings = self._extract_headings(soup, title)
+
+        # Extract the main content
+        with span("extract_content"):
+            details = microdata_details(soup)
+            content = microdata_article_body(soup) or self._extract_article_content(soup)
+
+        # Return the data
+        article_data = {
+            'url': url,
+            'title': title,
+            'headings': headings,
+            'content': content,
+            'timestamp': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        article_data.update(details)
+        if links is not None:
+            article_data['links'] = links
+        return article_data
+
+    def _scrape_continuation_page(self, url):
+        """Fetch one later page of an article, returning (headings, content, further page URLs)"""
+        response, soup = self._fetch_soup(url)
+        page_urls = find_page_urls(soup, response.url)
+        headings = self._extract_headings(soup, None)
+        content = self._extract_article_content(soup)
+        return headings, content, page_urls
+
+    def _stitch_continuation_pages(self, url, headings, content, page_urls):
+        """Fetch the later pages of a multi-page article and merge them with the first
+
+        Every page the first page points to is fetched at once on a small
+        thread pool, so a five-page article costs about one round trip
+        instead of four sequential ones. Pages only reachable by following
+        rel="next" from the last fetched page are picked up in further
+        rounds. Returns (headings, content, set of fetched page URLs).
+        """
+        pages = {1: (headings, content)}
+        fetched = {url}
+        pending = [(number, page_url) for number, page_url in page_urls if page_url != url]
+
+        with span("pagination", url=url) as span_args:
+            with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+                while pending and len(pages) < MAX_PAGES:
+                    batch = pending[:MAX_PAGES - len(pages)]
+                    fetched.update(page_url for _, page_url in batch)
+                    futures = [(number, page_url, executor.submit(self._scrape_continuation_page, page_url))
+                               for number, page_url in batch]
+
+                    pending = {}
+                    for number, page_url, future in futures:
+                        try:
+                            page_headings, page_content, more_pages = future.result()
+                        except Exception as e:
+                            self._update_status(f"Could not fetch page {number} of {url}: {str(e)}")
+                            continue
+                        pages[number] = (page_headings, page_content)
+                        for more_number, more_url in more_pages:
+                            if more_url not in fetched and more_number not in pages:
+                                pending[more_number] = more_url
+                    pending = sorted(pending.items())
+
+            span_args['pages'] = len(pages)
+
+        if len(pages) > 1:
+            self._update_status(f"Stitched {len(pages)} pages together: {url}")
+        headings, content = stitch_pages(pages[number] for number in sorted(pages))
+        return headings, content, fetched
+
+    def _extract_links(self, soup, base_url):
+        """Collect the absolute URLs of all links on the page"""
+        links = []
+        for anchor in soup.find_all('a', href=True):
+            href = anchor['href'].strip()
+            if href and not href.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
+                links.append(urljoin(base_url, href))
+        return links
+
+    def _extract_headings(self, soup, title):
+        """Extract the h1-h3 headings, skipping navigation text"""
+        headings = []
+        for heading in soup.find_all(['h1', 'h2', 'h3']):
+            text = heading.get_text(strip=True)
+            if _is_content_heading(text):
+                headings.append(text)
+
+        # If no headings were found, use the title as the first heading
+        if not headings and title:
+            headings = [title]
+
+        return headings
+
+    def _extract_title(self, soup):
+        """Extract the title of the article"""
+        title_candidates = []
+
+        # Try different title sources in order of reliability for article content
+
+        # 1. Schema.org article headline
+        article_headline = soup.find('meta', {'itemprop': 'headline'})
+        if article_headline and article_headline.get('content'):
+            title_candidates.append(article_headline['content'].strip())
+
+        # 2. Open Graph title
+        og_title = soup.find('meta', property='og:title') or soup.find('meta', attrs={'name': 'og:title'})
+        if og_title and og_title.get('content'):
+            title_candidates.append(og_title['content'].strip())
+
+        # 3. Twitter card title
+        twitter_title = soup.find('meta', attrs={'name': 'twitter:title'})
+        if twitter_title and twitter_title.get('content'):
+            title_candidates.append(twitter_title['content'].strip())
+
+        # 4. Main heading
+        main_heading = soup.find('h1')
+        if main_heading and main_heading.text.strip():
+            # Make sure it's not a site name or navigation
+            heading_text = main_heading.text.strip()
+            if len(heading_text.split()) > 1 and not any(nav_term in heading_text.lower() for nav_term in ['home', 'menu', 'navigation']):
+                title_candidates.append(heading_text)
+
+        # 5. Page title tag
+        title_tag = soup.find('title')
+        if title_tag and title_tag.string:
+            page_title = title_tag.string.strip()
+
+            # Try to remove site name from title
+            if ' | ' in page_title:
+                page_title = page_title.split(' | ')[0].strip()
+            elif ' - ' in page_title:
+                page_title = page_title.split(' - ')[0].strip()
+            elif ' – ' in page_title:
+                page_title = page_title.split(' – ')[0].strip()
+
+            title_candidates.append(page_title)
+
+        # 6. Any other h1 if we still don't have candidates
+        if not title_candidates:
+            for h1 in soup.find_all('h1'):
+                if h1.text.strip() and len(h1.text.strip()) > 10:  # Require a minimum length
+                    title_candidates.append(h1.text.strip())
+                    break
+
+        # Choose the best title from candidates
+        if title_candidates:
+            # Prefer longer titles as they are typically more descriptive
+            # But not too long (avoid full paragraphs)
+            filtered_candidates = [t for t in title_candidates if 3 < len(t.split()) < 20]
+
+            if filtered_candidates:
+                return max(filtered_candidates, key=len)
+            else:
+                # If no good candidates after filtering, take the first one
+                return title_candidates[0]
+
+        return "No title found"
+
+    def _extract_article_content(self, soup):
+        """Extract the main content of the article"""
+        # Try to identify the main article content by common patterns
+        article_candidates = []
+
+        # Look for article tag
+        article = soup.find('article')
+        if article:
+            article_candidates.append(article)
+
+        # Look for common content div IDs and classes
+        content_selectors = [
+            '#content', '.content',
+            '#main', '.main',
+            '#article', '.article',
+            '#post', '.post',
+            '.post-content', '.entry-content',
+            '.article-body', '.story-body',
+            '.article-content', '.entry',
+            '.main-content', '.page-content',
+            '.story', '.blog-post',
+            '.cms-content', '.node-content',
+            '.rich-text', '.article__body',
+            '.entry__content', '.post__content'
+        ]
+
+        for selector in content_selectors:
+            elements = soup.select(selector)
+            if elements:
+                article_candidates.extend(elements)
+
+        # Find the candidate with the most text content, excluding navigation, ads, etc.
+        if article_candidates:
+            # Clean up candidates before measuring text length
+            with span("decompose", candidates=len(article_candidates)):
+                for candidate in article_candidates:
+                    # Create a deep copy to work with
+                    candidate_copy = candidate
+
+                    # Remove unwanted elements from the copy
+                    for unwanted in candidate_copy.find_all(['script', 'style', 'iframe', 'nav', 'footer', 'header',
+                                                           'aside', '.sidebar', '.widget', '.ad', '.advertisement',
+                                                           '.social', '.comments', '.related', '.recommended',
+                                                           '.newsletter', '.promo']):
+                        unwanted.decompose()
+
+            # Sort by text length and pick the longest
+            article_candidates.sort(key=lambda x: len(x.get_text(strip=True)), reverse=True)
+            main_content = article_candidates[0]
+
+            # Clean up the content more thoroughly
+            with span("decompose"):
+                for tag in main_content.find_all(['script', 'style', 'iframe', 'nav', 'footer', 'header',
+                                               'button', '.nav', '.menu', '.sidebar', '.widget', '.ad',
+                                               '.social-share', '.share-buttons', '.comments', '.comment-section',
+                                               '.related-posts', '.recommended-articles', '.newsletter-signup']):
+                    tag.decompose()
+
+            # Get all paragraphs from main content
+            paragraphs = []
+            for p in main_content.find_all('p'):
+                text = p.get_text(strip=True)
+                # Filter out short or likely non-article paragraphs
+                if text and len(text.split()) > 4 and not re.match(r'^(share|posted by|written by|author:|date:|published:).*$', text.lower()):
+                    paragraphs.append(text)
+
+            if paragraphs:
+                return "\n\n".join(paragraphs)
+
+            # Fallback to full text if paragraph extraction failed
+            content = main_content.get_text(separator="\n").strip()
+            content = re.sub(r'\n{3,}', '\n\n', content)  # Remove excessive newlines
+            content = re.sub(r'[\t ]+', ' ', content)     # Normalize whitespace
+            return content
+
+        # Fallback: extract all paragraph text
+        paragraphs = []
+        for p in soup.find_all('p'):
+            text = p.get_text(strip=True)
+            # More aggressive filtering for potential non-content paragraphs
+            if text and len(text.split()) > 5 and not any(phrase in text.lower() for phrase in
+                                                       ['cookie', 'privacy policy', 'terms of service',
+                                                        'copyright', 'all rights reserved', 'newsletter',
+                                                        'sign up', 'subscribe']):
+                paragraphs.append(text)
+
+        if paragraphs:
+            return "\n\n".join(paragraphs)
+
+        # Last resort: get the main text content while filtering out common non-content areas
+        body = soup.find('body')
+        if body:
+            # Remove non-content elements
+            non_content_selectors = [
+                'header', 'footer', 'nav', 'aside',
+                '.sidebar', '.widget', '.comments', '.ad',
+                '.advertisement', '.menu', '.navigation',
+                '.social', '.share', '.related', '.recommended'
+            ]
+
+            with span("decompose"):
+                for selector in non_content_selectors:
+                    for element in body.select(selector):
+                        element.decompose()
+
+                # Also remove script, style, etc.
+                for tag in body.find_all(['script', 'style', 'iframe', 'noscript']):
+                    tag.decompose()
+
+            # Extract and clean the text
+            content = body.get_text(separator="\n").strip()
+            content = re.sub(r'\n{3,}', '\n\n', content)  # Remove excessive newlines
+            content = re.sub(r'[\t ]+', ' ', content)     # Normalize whitespace
+
+            # Try to find the part of the content with the highest content density
+            lines = content.split('\n')
+            if len(lines) > 20:  # If content is long enough to be worth analyzing
+                # Find longest consecutive group of non-empty lines (likely the article)
+                best_start = 0
+                best_length = 0
+                current_start = 0
+                current_length = 0
+
+                for i, line in enumerate(lines):
+                    if line.strip():
+                        if current_length == 0:
+                            current_start = i
+                        current_length += 1
+                    else:
+                        if current_length > best_length:
+                            best_start = current_start
+                            best_length = current_length
+                        current_length = 0
+
+                # Handle the case where the best segment is at the end
+                if current_length > best_length:
+                    best_start = current_start
+                    best_length = current_length
+
+                # Extract the best content segment if it's significant
+                if best_length > 5:
+                    content = '\n'.join(lines[best_start:best_start + best_length])
+
+            return content
+
+        return "No content found"
+
+
+def export_to_excel(articles, output_dir, prefix="scraped_data"):
+    """Export a list of article records to a new Excel file
+
+    Rows are streamed into a write-only workbook one article at a time,
+    so only a single article body is expanded in memory while writing.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    # Create a timestamp for the filename
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = os.path.join(output_dir, f"{prefix}_{timestamp}.xlsx")
+
+    # Find the maximum number of headings, without loading compressed bodies
+    max_headings = 1  # Always have at least the first heading
+    for article in articles:
+        heading_count = getattr(article, 'heading_count', None)
+        if heading_count is None:
+            heading_count = len(article['headings'])
+        max_headings = max(max_headings, heading_count)
+
+    # Define column names, with additional heading columns
+    columns = ['Timestamp', 'URL', 'First Heading', 'Content']
+    for i in range(1, max_headings):
+        columns.append(f'Heading {i+1}')
+
+    # Author and dates from structured data, and the changes found in watch mode, get their own
+    # columns when any article has them
+    metadata_columns = [(key, name) for key, name in METADATA_COLUMNS + CHANGE_COLUMNS
+                        if any(article.get(key) for article in articles)]
+    columns.extend(name for _, name in metadata_columns)
+
+    # Near-duplicates that were kept get a last column pointing at the original
+    flag_duplicates = any(article.get('duplicate_of') for article in articles)
+    if flag_duplicates:
+        columns.append('Duplicate Of')
+
+    with span("export_excel", articles=len(articles)):
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+
+        header = []
+        for column in columns:
+            cell = WriteOnlyCell(sheet, value=column)
+            cell.font = Font(bold=True)
+            header.append(cell)
+        sheet.append(header)
+
+        for article in articles:
+            # Expand compressed records once per row
+            if hasattr(article, 'to_dict'):
+                article = article.to_dict()
+
+            # Basic columns, then additional headings as separate columns
+            row = [
+                article['timestamp'],
+                article['url'],
+                article['headings'][0] if article['headings'] else "No heading",
+                article['content']
+            ]
+            row.extend(article['headings'][1:])
+            if metadata_columns:
+                row.extend([""] * (4 + max_headings - 1 - len(row)))
+                row.extend(article.get(key, "") for key, _ in metadata_columns)
+            if flag_duplicates:
+                row.extend([""] * (len(columns) - 1 - len(row)))
+                row.append(article.get('duplicate_of', ""))
+            sheet.append(row)
+
+        # Write to Excel
+        workbook.save(filename)
+
+    return filename
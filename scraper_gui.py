@@ -0,0 +1,861 @@
+#!/usr/bin/env python3
+# ExcellentScraper - CustomTkinter GUI
+
+import os
+import time
+import threading
+import queue
+import datetime
+import random
+from tkinter import filedialog
+import customtkinter as ctk
+
+# Set appearance mode and default color theme
+ctk.set_appearance_mode("dark")
+ctk.set_default_color_theme("blue")
+
+class ExcelLentScraper(ctk.CTk):
+    def __init__(self):
+        super().__init__()
+        
+        # Initialize window
+        self.title("ExcellentScraper")
+        self.geometry("1000x800")  # Wider and taller initial size
+        self.minsize(800, 600)     # Set minimum size
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=0)  # For the header
+        self.grid_rowconfigure(1, weight=1)  # For the main frame
+        self.grid_rowconfigure(2, weight=0)  # For the status bar
+        
+        # Global variables
+        self.url_entries = []
+        self.max_urls = 10
+        self.scraped_data = []
+        self.blob_store = None
+        self.search_window = None
+        self.scraping_in_progress = False
+        self.status_queue = queue.Queue()
+        self.output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraped_data")
+        
+        # Ensure the output directory exists
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+        
+        # Create the UI components
+        self._create_ui()
+        
+        # Start the status update thread
+        self._start_status_update_thread()
+        
+        # Bind keyboard shortcuts
+        self.bind("<Control-r>", lambda event: self._reset_url_fields())
+        
+        # Clean up the batch's temporary files when the window is closed
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+    
+    def _on_close(self):
+        """Delete the last batch's temporary article store and close the window"""
+        if self.blob_store:
+            self.blob_store.close()
+            self.blob_store = None
+        self.destroy()
+    
+    def _create_ui(self):
+        """Create the main UI components"""
+        
+        # Header frame with title and theme toggle
+        self.header_frame = ctk.CTkFrame(self, corner_radius=0, fg_color="transparent")
+        self.header_frame.grid(row=0, column=0, sticky="ew", padx=20, pady=(20, 0))
+        self.header_frame.grid_columnconfigure(0, weight=1)
+        self.header_frame.grid_columnconfigure(1, weight=0)
+        self.header_frame.grid_columnconfigure(2, weight=0)
+        
+        # App title
+        title_label = ctk.CTkLabel(
+            self.header_frame,
+            text="ExcellentScraper",
+            font=ctk.CTkFont(size=24, weight="bold")
+        )
+        title_label.grid(row=0, column=0, sticky="w")
+        
+        # Search button - opens the search panel over everything scraped so far
+        self.search_button = ctk.CTkButton(
+            self.header_frame,
+            text="Search Articles",
+            command=self._open_search_panel
+        )
+        self.search_button.grid(row=0, column=1, padx=(20, 0), pady=20)
+        
+        # Theme toggle
+        self.appearance_mode_menu = ctk.CTkOptionMenu(
+            self.header_frame,
+            values=["Dark", "Light"],
+            command=self._change_appearance_mode
+        )
+        self.appearance_mode_menu.grid(row=0, column=2, padx=20, pady=20)
+        self.appearance_mode_menu.set("Dark")
+        
+        # Main frame for the app content
+        self.main_frame = ctk.CTkFrame(self)
+        self.main_frame.grid(row=1, column=0, sticky="nsew", padx=20, pady=20)
+        self.main_frame.grid_columnconfigure(0, weight=1)
+        self.main_frame.grid_rowconfigure(0, weight=1)  # Let content_frame expand
+        
+        # Create inner content frame to organize components
+        content_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
+        content_frame.grid(row=0, column=0, sticky="nsew")
+        content_frame.grid_columnconfigure(0, weight=1)
+        content_frame.grid_rowconfigure(0, weight=0)  # URL frame
+        content_frame.grid_rowconfigure(1, weight=0)  # Control frame
+        content_frame.grid_rowconfigure(2, weight=1)  # Log frame (should expand)
+        
+        # URL input section - make it more compact
+        self.url_frame = ctk.CTkFrame(content_frame)
+        self.url_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=10)
+        self.url_frame.grid_columnconfigure(0, weight=1)
+        
+        # Configure rows for URL entries (up to max_urls + additional rows for label and buttons)
+        for i in range(self.max_urls + 3):  # +3 for label, spacing, and button row
+            self.url_frame.grid_rowconfigure(i, weight=0)
+        
+        url_label = ctk.CTkLabel(
+            self.url_frame,
+            text="Enter URLs to scrape (all 10 fields ready):",
+            font=ctk.CTkFont(size=16)
+        )
+        url_label.grid(row=0, column=0, sticky="w", padx=10, pady=(10, 5))
+        
+        # Create a container frame for the URL entries
+        self.url_entries_container = ctk.CTkFrame(self.url_frame, fg_color="transparent")
+        self.url_entries_container.grid(row=1, column=0, sticky="ew", padx=10, pady=5)
+        self.url_entries_container.grid_columnconfigure(0, weight=1)  # First column
+        self.url_entries_container.grid_columnconfigure(1, weight=1)  # Second column
+        
+        # Configure rows for the two-column layout
+        for i in range((self.max_urls // 2) + (self.max_urls % 2)):  # Rows needed for an even distribution
+            self.url_entries_container.grid_rowconfigure(i, weight=0)
+        
+        # Button frame for URL entries - position it after the URL entries
+        self.url_button_frame = ctk.CTkFrame(self.url_frame, fg_color="transparent")
+        self.url_button_frame.grid(row=2, column=0, sticky="ew", padx=10, pady=5)
+        
+        # Add URL button
+        self.add_url_button = ctk.CTkButton(
+            self.url_button_frame,
+            text="Add URL",
+            command=lambda: self._add_url_entry(animate=True)
+        )
+        self.add_url_button.grid(row=0, column=0, padx=5, pady=5)
+        
+        # Remove URL button
+        self.remove_url_button = ctk.CTkButton(
+            self.url_button_frame,
+            text="Remove URL",
+            command=self._remove_url_entry,
+            fg_color="#D35B58",
+            hover_color="#C77C78"
+        )
+        self.remove_url_button.grid(row=0, column=1, padx=5, pady=5)
+        
+        # Reset button to clear all URL fields
+        self.reset_button = ctk.CTkButton(
+            self.url_button_frame,
+            text="Reset Fields (Ctrl+R)",
+            command=self._reset_url_fields,
+            fg_color="#3A7EBF",
+            hover_color="#5B95D0",
+            width=140  # Make the button wider to fit the text
+        )
+        self.reset_button.grid(row=0, column=2, padx=5, pady=5)
+        
+        # Create all ten URL entries at startup instead of just one
+        for _ in range(self.max_urls):
+            self._add_url_entry(animate=False)
+        
+        # Control frame
+        self.control_frame = ctk.CTkFrame(content_frame)
+        self.control_frame.grid(row=1, column=0, sticky="ew", padx=10, pady=10)
+        
+        # Scrape button
+        self.scrape_button = ctk.CTkButton(
+            self.control_frame,
+            text="Start Scraping",
+            command=self._start_scraping,
+            height=40,
+            font=ctk.CTkFont(size=16, weight="bold")
+        )
+        self.scrape_button.grid(row=0, column=0, padx=10, pady=10)
+        
+        # Merge button
+        self.merge_button = ctk.CTkButton(
+            self.control_frame,
+            text="Merge Excel Files",
+            command=self._merge_excel_files,
+            height=40,
+            font=ctk.CTkFont(size=16)
+        )
+        self.merge_button.grid(row=0, column=1, padx=10, pady=10)
+        
+        # Crawl button - discovers article URLs starting from the first URL field
+        self.crawl_button = ctk.CTkButton(
+            self.control_frame,
+            text="Crawl Site",
+            command=self._start_crawling,
+            height=40,
+            font=ctk.CTkFont(size=16)
+        )
+        self.crawl_button.grid(row=0, column=2, padx=10, pady=10)
+        
+        # Maximum number of pages to scrape when crawling
+        self.crawl_limit_entry = ctk.CTkEntry(self.control_frame, width=80, placeholder_text="Max pages")
+        self.crawl_limit_entry.grid(row=0, column=3, padx=10, pady=10)
+        self.crawl_limit_entry.insert(0, "100")
+        
+        # What to do with articles that are near-duplicates of ones scraped before
+        self.duplicates_menu = ctk.CTkOptionMenu(
+            self.control_frame,
+            values=["Drop duplicates", "Flag duplicates", "Keep duplicates"]
+        )
+        self.duplicates_menu.grid(row=0, column=4, padx=10, pady=10)
+        self.duplicates_menu.set("Drop duplicates")
+        
+        # Record per-stage timings for the next batch, optionally with cProfile or tracemalloc per URL
+        self.profile_menu = ctk.CTkOptionMenu(
+            self.control_frame,
+            values=["No profiling", "Profile stages", "Profile + cProfile", "Profile + tracemalloc",
+                    "Profile + both"]
+        )
+        self.profile_menu.grid(row=0, column=5, padx=10, pady=10)
+        self.profile_menu.set("No profiling")
+        
+        # Keep the raw pages in a WARC archive so they can be re-extracted later without refetching
+        self.archive_checkbox = ctk.CTkCheckBox(self.control_frame, text="Archive pages")
+        self.archive_checkbox.grid(row=0, column=6, padx=10, pady=10)
+        
+        # Status and log section
+        self.log_frame = ctk.CTkFrame(content_frame)
+        self.log_frame.grid(row=2, column=0, sticky="nsew", padx=10, pady=10)
+        self.log_frame.grid_rowconfigure(1, weight=1)
+        self.log_frame.grid_columnconfigure(0, weight=1)
+        
+        log_label = ctk.CTkLabel(
+            self.log_frame,
+            text="Status Log:",
+            font=ctk.CTkFont(size=16)
+        )
+        log_label.grid(row=0, column=0, sticky="w", padx=10, pady=5)
+        
+        # Status log text area
+        self.log_text = ctk.CTkTextbox(self.log_frame, height=200)
+        self.log_text.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
+        self.log_text.configure(state="disabled")
+        
+        # Status bar at the bottom
+        self.status_bar = ctk.CTkLabel(
+            self,
+            text="Ready",
+            font=ctk.CTkFont(size=12),
+            anchor="w"
+        )
+        self.status_bar.grid(row=2, column=0, sticky="ew", padx=20, pady=(0, 10))
+        
+        # Progress bar
+        self.progress_bar = ctk.CTkProgressBar(self)
+        self.progress_bar.grid(row=3, column=0, sticky="ew", padx=20, pady=(0, 20))
+        self.progress_bar.set(0)
+    
+    def _add_url_entry(self, animate=True):
+        """Add a new URL entry field"""
+        if len(self.url_entries) >= self.max_urls:
+            self._update_status("Maximum number of URLs reached (10)")
+            return
+        
+        # Create a frame for the URL entry
+        entry_idx = len(self.url_entries)  # 0-based index
+        
+        # Calculate row and column position in the grid
+        row = entry_idx // 2  # Integer division for row number
+        col = entry_idx % 2   # Remainder for column (0 or 1)
+        
+        entry_frame = ctk.CTkFrame(self.url_entries_container, fg_color="transparent")
+        entry_frame.grid(row=row, column=col, sticky="ew", padx=10, pady=5)
+        entry_frame.grid_columnconfigure(1, weight=1)
+        
+        # Label with the entry number
+        entry_label = ctk.CTkLabel(entry_frame, text=f"{entry_idx + 1}.", width=20)
+        entry_label.grid(row=0, column=0, padx=(0, 5))
+        
+        # URL entry field
+        url_entry = ctk.CTkEntry(
+            entry_frame,
+            placeholder_text=f"Enter URL {entry_idx + 1}"
+        )
+        url_entry.grid(row=0, column=1, sticky="ew", padx=5)
+        
+        self.url_entries.append((entry_frame, url_entry))
+        
+        # Update add/remove button states
+        self._update_url_buttons()
+        
+        # Add a little sparkle animation only if requested
+        if animate and entry_idx > 0:  # Don't animate the first entry
+            self._animate_entry_addition(entry_frame)
+    
+    def _animate_entry_addition(self, frame):
+        """Create a small animation when adding a new entry"""
+        original_color = frame.cget("fg_color")
+        highlight_color = "#2a6496" if ctk.get_appearance_mode() == "Dark" else "#a2d2ff"
+        
+        def _animate_step(step=0, max_steps=10):
+            if step <= max_steps:
+                # Gradually fade from highlight color to original
+                blend_factor = step / max_steps
+                r1, g1, b1 = [int(highlight_color[1:3], 16), int(highlight_color[3:5], 16), int(highlight_color[5:7], 16)]
+                
+                # Handle the case where original_color might be "transparent"
+                if original_color == "transparent":
+                    r2, g2, b2 = [40, 40, 40] if ctk.get_appearance_mode() == "Dark" else [240, 240, 240]
+                else:
+                    r2, g2, b2 = [int(original_color[1:3], 16), int(original_color[3:5], 16), int(original_color[5:7], 16)]
+                
+                r = int(r1 * (1 - blend_factor) + r2 * blend_factor)
+                g = int(g1 * (1 - blend_factor) + g2 * blend_factor)
+                b = int(b1 * (1 - blend_factor) + b2 * blend_factor)
+                
+                current_color = f"#{r:02x}{g:02x}{b:02x}"
+                frame.configure(fg_color=current_color)
+                self.after(30, lambda: _animate_step(step + 1, max_steps))
+            else:
+                frame.configure(fg_color=original_color)
+        
+        _animate_step()
+    
+    def _remove_url_entry(self):
+        """Remove the last URL entry field"""
+        if not self.url_entries:
+            return
+        
+        # Get the last entry and remove it
+        entry_frame, _ = self.url_entries.pop()
+        entry_frame.destroy()
+        
+        # Update add/remove button states
+        self._update_url_buttons()
+    
+    def _reset_url_fields(self):
+        """Clear all URL entry fields without removing them"""
+        # Check if there are entries to clear
+        if not self.url_entries:
+            return
+            
+        # Clear each URL entry
+        for _, url_entry in self.url_entries:
+            url_entry.delete(0, 'end')  # Clear the entry
+        
+        # Show a brief status message
+        self._update_status("All URL fields have been cleared")
+        
+        # Add a visual feedback effect
+        self._flash_url_container()
+    
+    def _flash_url_container(self):
+        """Provide visual feedback that the URL fields have been reset"""
+        original_color = self.url_entries_container.cget("fg_color")
+        highlight_color = "#2a6496" if ctk.get_appearance_mode() == "Dark" else "#a2d2ff"
+        
+        def _flash_step(step=0, max_steps=10):
+            if step <= max_steps:
+                # Gradually fade from highlight color to original
+                blend_factor = step / max_steps
+                r1, g1, b1 = [int(highlight_color[1:3], 16), int(highlight_color[3:5], 16), int(highlight_color[5:7], 16)]
+                
+                # Handle the case where original_color might be "transparent"
+                if original_color == "transparent":
+                    r2, g2, b2 = [40, 40, 40] if ctk.get_appearance_mode() == "Dark" else [240, 240, 240]
+                else:
+                    r2, g2, b2 = [int(original_color[1:3], 16), int(original_color[3:5], 16), int(original_color[5:7], 16)]
+                
+                r = int(r1 * (1 - blend_factor) + r2 * blend_factor)
+                g = int(g1 * (1 - blend_factor) + g2 * blend_factor)
+                b = int(b1 * (1 - blend_factor) + b2 * blend_factor)
+                
+                current_color = f"#{r:02x}{g:02x}{b:02x}"
+                self.url_entries_container.configure(fg_color=current_color)
+                self.after(30, lambda: _flash_step(step + 1, max_steps))
+            else:
+                self.url_entries_container.configure(fg_color=original_color)
+        
+        _flash_step()
+    
+    def _update_url_buttons(self):
+        """Update the state of the add/remove URL buttons"""
+        if len(self.url_entries) >= self.max_urls:
+            self.add_url_button.configure(state="disabled")
+        else:
+            self.add_url_button.configure(state="normal")
+        
+        if not self.url_entries:
+            self.remove_url_button.configure(state="disabled")
+        else:
+            self.remove_url_button.configure(state="normal")
+    
+    def _change_appearance_mode(self, mode):
+        """Change the app's appearance mode (dark/light)"""
+        ctk.set_appearance_mode(mode.lower())
+        self._update_status(f"Theme changed to {mode} mode")
+    
+    def _update_status(self, message):
+        """Update the status bar and log with a message"""
+        current_time = datetime.datetime.now().strftime("%H:%M:%S")
+        formatted_message = f"[{current_time}] {message}"
+        
+        # Add to the queue (thread-safe)
+        self.status_queue.put(formatted_message)
+    
+    def _start_status_update_thread(self):
+        """Start a thread to update the status display"""
+        def update_status_display():
+            while True:
+                try:
+                    # Check if there are any status updates in the queue
+                    if not self.status_queue.empty():
+                        message = self.status_queue.get()
+                        
+                        # Update the status bar
+                        self.status_bar.configure(text=message.split("] ")[1])
+                        
+                        # Update the log text
+                        self.log_text.configure(state="normal")
+                        self.log_text.insert("end", message + "\n")
+                        self.log_text.see("end")
+                        self.log_text.configure(state="disabled")
+                    
+                    # Sleep briefly to reduce CPU usage
+                    time.sleep(0.1)
+                except Exception as e:
+                    print(f"Error in status update thread: {e}")
+        
+        # Start the thread
+        threading.Thread(target=update_status_display, daemon=True).start()
+    
+    def _collect_urls(self):
+        """Collect URLs from the entry fields"""
+        urls = []
+        for _, url_entry in self.url_entries:
+            url = url_entry.get().strip()
+            if url:
+                # Add http:// if it's missing
+                if not url.startswith(("http://", "https://")):
+                    url = "https://" + url
+                urls.append(url)
+        return urls
+    
+    def _start_scraping(self):
+        """Start the scraping process"""
+        if self.scraping_in_progress:
+            self._update_status("Scraping already in progress")
+            return
+        
+        urls = self._collect_urls()
+        if not urls:
+            self._update_status("No URLs entered. Please enter at least one URL")
+            return
+        
+        # Disable buttons during scraping
+        self._set_scraping_state(True)
+        
+        # Start the scraping thread
+        threading.Thread(target=self._scrape_urls, args=(urls,), daemon=True).start()
+    
+    def _start_crawling(self):
+        """Start crawling the site of the first URL for articles to scrape"""
+        if self.scraping_in_progress:
+            self._update_status("Scraping already in progress")
+            return
+        
+        urls = self._collect_urls()
+        if not urls:
+            self._update_status("Enter the site to crawl in the first URL field")
+            return
+        
+        try:
+            max_pages = int(self.crawl_limit_entry.get())
+        except ValueError:
+            self._update_status("Max pages must be a whole number")
+            return
+        
+        # Disable buttons during scraping
+        self._set_scraping_state(True)
+        
+        # Discovery fetches robots.txt and sitemaps, so it runs in the scraping thread too
+        threading.Thread(target=self._crawl_site, args=(urls[0], max_pages), daemon=True).start()
+    
+    def _crawl_site(self, seed_url, max_pages):
+        """Discover URLs on a site and stream them into the scraper"""
+        from frontier import Frontier
+        
+        self._update_status(f"Discovering URLs on {seed_url}...")
+        frontier = Frontier(seed_url, max_urls=max_pages, status_callback=self._update_status)
+        try:
+            frontier.discover()
+            self._scrape_urls(frontier, frontier=frontier)
+        finally:
+            frontier.close()
+    
+    def _set_scraping_state(self, scraping):
+        """Disable or re-enable the controls while a batch is running"""
+        if scraping:
+            self.scrape_button.configure(state="disabled", text="Scraping...")
+            self.merge_button.configure(state="disabled")
+            self.crawl_button.configure(state="disabled")
+            
+            # Reset progress bar
+            self.progress_bar.set(0)
+        else:
+            self.scrape_button.configure(state="normal", text="Start Scraping")
+            self.merge_button.configure(state="normal")
+            self.crawl_button.configure(state="normal")
+        self.scraping_in_progress = scraping
+    
+    def _scrape_urls(self, urls, frontier=None):
+        """Scrape the provided URLs in a thread
+        
+        urls can be any iterable. When a frontier is given, links found on
+        each scraped page are fed back into it, so the crawl keeps going
+        until the frontier runs dry or hits its page limit.
+        """
+        # Imported on first use so the window opens without loading the scraping stack
+        from scraper_core import ArticleScraper
+        from record_store import ArticleRecord, open_blob_store
+        from dedup_index import DuplicateIndex
+        from page_archive import PageArchive
+        from profiling import span, profile_url, start_profiling, stop_profiling
+        
+        profile_mode = self.profile_menu.get()
+        if profile_mode != "No profiling":
+            start_profiling(use_cprofile=profile_mode in ("Profile + cProfile", "Profile + both"),
+                            use_tracemalloc=profile_mode in ("Profile + tracemalloc", "Profile + both"))
+        
+        total = frontier.max_urls if frontier else len(urls)
+        self._update_status(f"Starting to scrape {'up to ' if frontier else ''}{total} URLs...")
+        self.scraped_data = []
+        
+        # Article bodies are kept compressed on disk until export; drop the previous batch's
+        if self.blob_store:
+            self.blob_store.close()
+        self.blob_store = open_blob_store()
+        
+        # The scraper initializes its webdriver lazily, only when needed
+        scraper = ArticleScraper(status_callback=self._update_status)
+        scraper.collect_links = frontier is not None
+        if self.archive_checkbox.get():
+            scraper.archive = PageArchive(os.path.join(self.output_dir, "archive"))
+        
+        # The duplicate index persists across runs, so copies of earlier batches are caught too
+        duplicates_mode = self.duplicates_menu.get().split()[0].lower()
+        dedup_index = DuplicateIndex(os.path.join(self.output_dir, "duplicates.db"))
+        
+        for i, url in enumerate(urls):
+            try:
+                # Update progress
+                progress = (i) / total
+                self.progress_bar.set(progress)
+                
+                self._update_status(f"Scraping URL {i+1}/{total}: {url}")
+                
+                with profile_url(url):
+                    # Try BeautifulSoup first, then Selenium
+                    article_data = scraper.scrape(url)
+                    
+                    # Feed newly found links back into the crawl
+                    links = article_data.pop('links', None)
+                    if frontier and links:
+                        with span("frontier_add", links=len(links)):
+                            frontier.add_links(links)
+                    
+                    # Check for syndicated copies, AMP versions and the like
+                    duplicate_of = None
+                    if duplicates_mode != "keep":
+                        with span("dedupe"):
+                            duplicate_of = dedup_index.check_and_add(url, article_data['content'])
+                    
+                    if duplicate_of and duplicates_mode == "drop":
+                        self._update_status(f"Skipping near-duplicate of {duplicate_of}: {url}")
+                    else:
+                        if duplicate_of:
+                            self._update_status(f"Flagged as near-duplicate of {duplicate_of}: {url}")
+                            article_data['duplicate_of'] = duplicate_of
+                        
+                        # Add the scraped data
+                        with span("store_record"):
+                            self.scraped_data.append(ArticleRecord.from_article(article_data, self.blob_store))
+                
+                # Add some randomized delay to prevent rate limiting
+                time.sleep(random.uniform(0.5, 2.0))
+                
+            except Exception as e:
+                self._update_status(f"Error scraping {url}: {str(e)}")
+        
+        # Close the driver if it was initialized
+        scraper.close()
+        dedup_index.close()
+        if scraper.archive:
+            self._update_status(f"Archived {scraper.archive.count()} pages in: {scraper.archive.path}")
+            scraper.archive.close()
+        
+        # Export the data to Excel
+        if self.scraped_data:
+            filename = self._export_to_excel()
+            self._update_status(f"Exported data to: {filename}")
+        else:
+            self._update_status("No data was scraped")
+        
+        # Write the trace and hotspot summary if this batch was profiled
+        profiler = stop_profiling()
+        if profiler:
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            trace_path, summary_path = profiler.write(os.path.join(self.output_dir, "profiles", f"profile_{timestamp}"))
+            self._update_status(f"Profile trace written to: {trace_path} (open in chrome://tracing or ui.perfetto.dev)")
+            self._update_status(f"Profile summary written to: {summary_path}")
+        
+        # Complete
+        self.progress_bar.set(1.0)
+        self._update_status("Scraping completed - You can now reset the fields for a new batch")
+        
+        # Re-enable buttons
+        self._set_scraping_state(False)
+    
+    def _export_to_excel(self):
+        """Export the scraped data to an Excel file and add it to the search index"""
+        from scraper_core import export_to_excel
+        from search_index import SearchIndex
+        from profiling import span
+        
+        filename = export_to_excel(self.scraped_data, self.output_dir)
+        
+        try:
+            with span("search_index", articles=len(self.scraped_data)):
+                search_index = SearchIndex(os.path.join(self.output_dir, "search.db"))
+                search_index.add_articles(self.scraped_data)
+                search_index.close()
+        except Exception as e:
+            self._update_status(f"Error updating search index: {str(e)}")
+        
+        return filename
+    
+    def _open_search_panel(self):
+        """Open a window for searching previously scraped articles"""
+        if self.search_window is not None and self.search_window.winfo_exists():
+            self.search_window.focus()
+            return
+        
+        self.search_window = ctk.CTkToplevel(self)
+        self.search_window.title("Search Scraped Articles")
+        self.search_window.geometry("900x600")
+        self.search_window.grid_columnconfigure(0, weight=1)
+        self.search_window.grid_rowconfigure(1, weight=1)
+        
+        # Query and filters
+        filter_frame = ctk.CTkFrame(self.search_window)
+        filter_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=10)
+        filter_frame.grid_columnconfigure(0, weight=1)
+        
+        self.search_query_entry = ctk.CTkEntry(filter_frame, placeholder_text="Search words, \"exact phrase\", OR, NOT, prefix*")
+        self.search_query_entry.grid(row=0, column=0, sticky="ew", padx=5, pady=5)
+        
+        self.search_domain_entry = ctk.CTkEntry(filter_frame, width=150, placeholder_text="Domain")
+        self.search_domain_entry.grid(row=0, column=1, padx=5, pady=5)
+        
+        self.search_author_entry = ctk.CTkEntry(filter_frame, width=130, placeholder_text="Author")
+        self.search_author_entry.grid(row=0, column=2, padx=5, pady=5)
+        
+        self.search_since_entry = ctk.CTkEntry(filter_frame, width=110, placeholder_text="From YYYY-MM-DD")
+        self.search_since_entry.grid(row=0, column=3, padx=5, pady=5)
+        
+        self.search_until_entry = ctk.CTkEntry(filter_frame, width=110, placeholder_text="To YYYY-MM-DD")
+        self.search_until_entry.grid(row=0, column=4, padx=5, pady=5)
+        
+        search_button = ctk.CTkButton(filter_frame, text="Search", width=80, command=self._run_search)
+        search_button.grid(row=0, column=5, padx=5, pady=5)
+        
+        # Results
+        self.search_results_text = ctk.CTkTextbox(self.search_window)
+        self.search_results_text.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
+        self.search_results_text.configure(state="disabled")
+        
+        for entry in (self.search_query_entry, self.search_domain_entry, self.search_author_entry,
+                      self.search_since_entry, self.search_until_entry):
+            entry.bind("<Return>", lambda event: self._run_search())
+        self.search_query_entry.focus()
+    
+    def _run_search(self):
+        """Run the query from the search panel and show the results"""
+        from search_index import SearchIndex
+        
+        query = self.search_query_entry.get().strip()
+        index_path = os.path.join(self.output_dir, "search.db")
+        
+        if not query:
+            lines = ["Enter something to search for"]
+        elif not os.path.exists(index_path):
+            lines = ["Nothing has been indexed yet - articles are indexed when a batch is exported"]
+        else:
+            try:
+                search_index = SearchIndex(index_path)
+                start = time.perf_counter()
+                results = search_index.search(
+                    query,
+                    domain=self.search_domain_entry.get().strip() or None,
+                    since=self.search_since_entry.get().strip() or None,
+                    until=self.search_until_entry.get().strip() or None,
+                    limit=50,
+                    author=self.search_author_entry.get().strip() or None
+                )
+                elapsed = (time.perf_counter() - start) * 1000
+                search_index.close()
+                
+                lines = [f"{len(results)} results in {elapsed:.1f} ms", ""]
+                for result in results:
+                    lines.append(f"{result['title']}")
+                    lines.append(f"{result['url']}  ({result['timestamp']})")
+                    lines.append(f"    {result['snippet']}")
+                    lines.append("")
+            except ValueError:
+                lines = ["Dates must be in YYYY-MM-DD format"]
+            except Exception as e:
+                lines = [f"Search failed: {str(e)}"]
+        
+        self.search_results_text.configure(state="normal")
+        self.search_results_text.delete("1.0", "end")
+        self.search_results_text.insert("end", "\n".join(lines))
+        self.search_results_text.configure(state="disabled")
+    
+    def _merge_excel_files(self):
+        """Merge multiple Excel files"""
+        import pandas as pd
+        
+        # Open file dialog to select the files
+        files = filedialog.askopenfilenames(
+            title="Select Excel files to merge",
+            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
+            initialdir=self.output_dir
+        )
+        
+        if not files:
+            self._update_status("No files selected for merging")
+            return
+        
+        self._update_status(f"Selected {len(files)} files for merging")
+        
+        # Ask for the output file
+        output_file = filedialog.asksaveasfilename(
+            title="Save merged Excel file as",
+            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
+            initialdir=self.output_dir,
+            defaultextension=".xlsx"
+        )
+        
+        if not output_file:
+            self._update_status("Merge operation cancelled")
+            return
+        
+        try:
+            # Start with an empty DataFrame or the first file if it exists
+            if os.path.exists(output_file):
+                merged_df = pd.read_excel(output_file, engine='openpyxl')
+                self._update_status(f"Loaded existing file: {output_file}")
+            else:
+                merged_df = pd.DataFrame()
+            
+            # Merge each file
+            for file in files:
+                try:
+                    df = pd.read_excel(file, engine='openpyxl')
+                    self._update_status(f"Reading file: {os.path.basename(file)}")
+                    
+                    # Append the data
+                    merged_df = pd.concat([merged_df, df], ignore_index=True)
+                    
+                    # Add a little delay for visual effect
+                    time.sleep(0.2)
+                    
+                except Exception as e:
+                    self._update_status(f"Error reading {os.path.basename(file)}: {str(e)}")
+            
+            # Remove copies of the same article
+            merged_df = self._drop_duplicate_rows(merged_df)
+            
+            # Save the merged DataFrame
+            merged_df.to_excel(output_file, index=False, engine='openpyxl')
+            self._update_status(f"Successfully merged files into: {output_file}")
+            
+            # Show a success animation
+            self._animate_merge_success()
+            
+        except Exception as e:
+            self._update_status(f"Error merging files: {str(e)}")
+    
+    def _drop_duplicate_rows(self, merged_df):
+        """Drop or flag exact and near-duplicate articles in merged data"""
+        from dedup_index import DuplicateIndex
+        
+        duplicates_mode = self.duplicates_menu.get().split()[0].lower()
+        if duplicates_mode == "keep" or merged_df.empty or 'Content' not in merged_df.columns:
+            return merged_df
+        
+        urls = merged_df['URL'].tolist() if 'URL' in merged_df.columns else [None] * len(merged_df)
+        
+        # Rows repeated verbatim, e.g. from merging the same file twice
+        first_row = {}
+        duplicate_of = []
+        for row_number, key in enumerate(zip(urls, merged_df['Content'])):
+            duplicate_of.append(first_row.get(key))
+            first_row.setdefault(key, row_number)
+        
+        # Syndicated copies under other URLs; a throwaway index keeps the merge independent of past runs
+        dedup_index = DuplicateIndex(":memory:")
+        for row_number, content in enumerate(merged_df['Content']):
+            if duplicate_of[row_number] is None and isinstance(content, str):
+                # Rows are keyed by position, since the same URL may appear in several files
+                match = dedup_index.check_and_add(str(row_number), content)
+                if match is not None:
+                    duplicate_of[row_number] = int(match)
+        dedup_index.close()
+        
+        flagged = [match is not None for match in duplicate_of]
+        if not any(flagged):
+            return merged_df
+        
+        if duplicates_mode == "drop":
+            self._update_status(f"Dropped {sum(flagged)} duplicate articles")
+            return merged_df[[not is_duplicate for is_duplicate in flagged]].reset_index(drop=True)
+        
+        self._update_status(f"Flagged {sum(flagged)} duplicate articles")
+        merged_df = merged_df.copy()
+        merged_df['Duplicate Of'] = [urls[match] if match is not None else None for match in duplicate_of]
+        return merged_df
+    
+    def _animate_merge_success(self):
+        """Animate a success message after merging files"""
+        success_frame = ctk.CTkFrame(self, corner_radius=10)
+        success_frame.place(relx=0.5, rely=0.5, anchor="center")
+        
+        success_label = ctk.CTkLabel(
+            success_frame,
+            text="✨ Files Merged Successfully! ✨",
+            font=ctk.CTkFont(size=18, weight="bold"),
+            padx=20,
+            pady=20
+        )
+        success_label.grid(row=0, column=0)
+        
+        # Fade out animation
+        def fade_out(alpha=1.0):
+            if alpha > 0:
+                success_frame.attributes("-alpha", alpha)
+                self.after(50, lambda: fade_out(alpha - 0.05))
+            else:
+                success_frame.destroy()
+        
+        # Start fade out after 2 seconds
+        self.after(2000, fade_out)
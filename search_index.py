@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# ExcellentScraper - Full-text search over the scraped corpus with SQLite FTS5
+
+import sqlite3
+import datetime
+from urllib.parse import urlsplit
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# BM25 column weights: a match in the title counts more than one in the headings or body
+TITLE_WEIGHT = 10.0
+HEADINGS_WEIGHT = 5.0
+CONTENT_WEIGHT = 1.0
+
+
+def _parse_date(value):
+    """Turn a YYYY-MM-DD string, datetime or epoch number into an epoch float"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    return datetime.datetime.strptime(value.strip(), "%Y-%m-%d").timestamp()
+
+
+class SearchIndex:
+    """Incremental full-text index of scraped articles
+
+    Titles, headings and content go into an FTS5 table ranked with BM25,
+    and a plain table alongside it holds the URL, domain, author and
+    scrape time for filtering. Articles are added as they are exported; adding a URL
+    again replaces its earlier version.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                url TEXT UNIQUE NOT NULL,
+                domain TEXT NOT NULL,
+                scraped_at REAL NOT NULL,
+                author TEXT
+            );
+            CREATE INDEX IF NOT EXISTS documents_domain ON documents (domain, scraped_at);
+            CREATE INDEX IF NOT EXISTS documents_date ON documents (scraped_at);
+            CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+                title, headings, content,
+                tokenize = 'porter unicode61 remove_diacritics 2'
+            );
+        """)
+
+        # Indexes created before authors were kept lack the column
+        try:
+            self.conn.execute("ALTER TABLE documents ADD COLUMN author TEXT")
+        except sqlite3.OperationalError:
+            pass
+
+    def close(self):
+        """Close the index database"""
+        self.conn.close()
+
+    def add_articles(self, articles):
+        """Index a batch of articles (scraper dicts or ArticleRecords)"""
+        added = 0
+        with self.conn:
+            for article in articles:
+                self._add(article)
+                added += 1
+        return added
+
+    def _add(self, article):
+        """Index one article, replacing any earlier version of its URL"""
+        scraped_at = getattr(article, 'scraped_at', None)
+        if hasattr(article, 'to_dict'):
+            # Expand compressed records once rather than once per field
+            article = article.to_dict()
+
+        url = article['url']
+        domain = urlsplit(url).netloc.lower()
+        if domain.startswith('www.'):
+            domain = domain[4:]
+
+        if scraped_at is None:
+            try:
+                scraped_at = datetime.datetime.strptime(str(article['timestamp']), TIMESTAMP_FORMAT).timestamp()
+            except (KeyError, ValueError):
+                scraped_at = datetime.datetime.now().timestamp()
+
+        row = self.conn.execute("SELECT id FROM documents WHERE url = ?", (url,)).fetchone()
+        if row:
+            self.conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (row[0],))
+            self.conn.execute("DELETE FROM documents WHERE id = ?", (row[0],))
+
+        cursor = self.conn.execute(
+            "INSERT INTO documents (url, domain, scraped_at, author) VALUES (?, ?, ?, ?)",
+            (url, domain, scraped_at, article.get('author') or None)
+        )
+        self.conn.execute(
+            "INSERT INTO documents_fts (rowid, title, headings, content) VALUES (?, ?, ?, ?)",
+            (cursor.lastrowid, article.get('title') or "", "\n".join(article['headings']), article['content'] or "")
+        )
+
+    def search(self, query, domain=None, since=None, until=None, limit=20, author=None):
+        """Return the best matching articles, best first
+
+        query uses FTS5 syntax (words, "exact phrases", OR, NOT, prefix*);
+        if it doesn't parse, its words are searched for literally instead.
+        since and until accept YYYY-MM-DD strings, datetimes or epoch times,
+        and author matches any part of the byline, ignoring case.
+        """
+        conditions = ["documents_fts MATCH ?"]
+        params = [query]
+        if domain:
+            domain = domain.lower()
+            if domain.startswith('www.'):
+                domain = domain[4:]
+            conditions.append("(d.domain = ? OR d.domain LIKE ?)")
+            params.extend([domain, f"%.{domain}"])
+        if author:
+            conditions.append("d.author LIKE ?")
+            params.append(f"%{author}%")
+        if since is not None:
+            conditions.append("d.scraped_at >= ?")
+            params.append(_parse_date(since))
+        if until is not None:
+            # Include the whole of the 'until' day
+            conditions.append("d.scraped_at < ?")
+            params.append(_parse_date(until) + (86400 if isinstance(until, str) else 0))
+
+        sql = f"""
+            SELECT d.url, d.domain, d.author, d.scraped_at, documents_fts.title,
+                   snippet(documents_fts, 2, '[', ']', '...', 16),
+                   bm25(documents_fts, {TITLE_WEIGHT}, {HEADINGS_WEIGHT}, {CONTENT_WEIGHT}) AS score
+            FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid
+            WHERE {' AND '.join(conditions)}
+            ORDER BY score
+            LIMIT ?
+        """
+        params.append(limit)
+
+        try:
+            rows = self.conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError:
+            # Not valid FTS5 syntax (e.g. a stray quote or hyphen), so search for the words as typed
+            params[0] = " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+            rows = self.conn.execute(sql, params).fetchall()
+
+        return [
+            {
+                'url': url,
+                'domain': domain,
+                'author': author or '',
+                'timestamp': datetime.datetime.fromtimestamp(scraped_at).strftime(TIMESTAMP_FORMAT),
+                'title': title,
+                'snippet': ' '.join(snippet.split()),
+                'score': -score  # bm25() is lower-is-better
+            }
+            for url, domain, author, scraped_at, title, snippet, score in rows
+        ]
+
+    def count(self):
+        """Return the number of indexed articles"""
+        return self.conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+
+def iter_excel_articles(filename):
+    """Stream the articles out of an exported or merged Excel file
+
+    The workbook is read in read-only mode one row at a time, so even
+    very large merged files can be indexed without loading them whole.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(filename, read_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell) if cell is not None else "" for cell in next(rows, [])]
+        if 'URL' not in header or 'Content' not in header:
+            return
+
+        heading_columns = [i for i, name in enumerate(header) if name == 'First Heading' or name.startswith('Heading ')]
+        for row in rows:
+            values = dict(zip(header, row))
+            if not values.get('URL'):
+                continue
+            headings = [str(row[i]) for i in heading_columns if i < len(row) and row[i] not in (None, "", "No heading")]
+            yield {
+                'url': str(values['URL']),
+                # Exports don't carry the title separately; the first heading is usually it
+                'title': headings[0] if headings else "",
+                'headings': headings,
+                'content': str(values.get('Content') or ""),
+                'timestamp': str(values.get('Timestamp') or ""),
+                'author': str(values.get('Author') or "")
+            }
+    finally:
+        workbook.close()
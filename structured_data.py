@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# ExcellentScraper - Read articles from JSON-LD and microdata without the DOM heuristics
+
+import re
+import json
+import html
+from urllib.parse import urljoin
+
+# schema.org types whose articleBody is the article text
+ARTICLE_TYPES = {
+    'Article', 'NewsArticle', 'ReportageNewsArticle', 'AnalysisNewsArticle', 'OpinionNewsArticle',
+    'BackgroundNewsArticle', 'ReviewNewsArticle', 'BlogPosting', 'LiveBlogPosting', 'TechArticle',
+    'ScholarlyArticle', 'Report', 'SocialMediaPosting'
+}
+
+# Bodies shorter than this are usually teasers or paywall stubs, so the page is parsed as usual
+MIN_BODY_WORDS = 150
+
+_LD_JSON_RE = re.compile(
+    rb'<script[^>]*type\s*=\s*["\']?application/ld\+json["\']?[^>]*>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL
+)
+_HEADING_RE = re.compile(rb'<h([1-3])(?:\s[^>]*)?>(.*?)</h\1\s*>', re.IGNORECASE | re.DOTALL)
+_LINK_RE = re.compile(rb'<a\s[^>]*?href\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.IGNORECASE)
+_REL_NEXT_RE = re.compile(rb'rel\s*=\s*["\']?[^>"\']*\bnext\b', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _decode(raw, encoding):
+    """Decode a slice of the page, never failing on stray bytes"""
+    return raw.decode(encoding or 'utf-8', errors='replace')
+
+
+def _strip_tags(text):
+    """Turn a fragment of markup into plain text"""
+    return ' '.join(html.unescape(_TAG_RE.sub(' ', text)).split())
+
+
+def _iter_objects(data):
+    """Walk a JSON-LD document, yielding every object including those in @graph and nested values"""
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_objects(item)
+    elif isinstance(data, dict):
+        yield data
+        for value in data.values():
+            if isinstance(value, (list, dict)):
+                yield from _iter_objects(value)
+
+
+def _is_article(item):
+    """Check whether a JSON-LD object is one of the article types"""
+    types = item.get('@type')
+    if isinstance(types, str):
+        types = [types]
+    return any(isinstance(t, str) and t.split('/')[-1] in ARTICLE_TYPES for t in types or [])
+
+
+def _names(value):
+    """Flatten a schema.org author/creator value into a comma-separated string"""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return str(value.get('name') or '').strip()
+    if isinstance(value, list):
+        return ', '.join(name for name in (_names(item) for item in value) if name)
+    return ''
+
+
+def text_paragraphs(body):
+    """Split an articleBody into paragraphs in the same format as the DOM extractor"""
+    if '<' in body and '>' in body:
+        # Some publishers put the article markup itself into articleBody
+        body = re.sub(r'(?i)</(?:p|h[1-6]|li|blockquote|div)\s*>|<br\s*/?>', '\n', body)
+        lines = [_strip_tags(line) for line in body.split('\n')]
+    else:
+        lines = [' '.join(html.unescape(line).split()) for line in body.split('\n')]
+    return "\n\n".join(line for line in lines if line)
+
+
+def find_json_ld_article(raw, encoding=None):
+    """Return the most complete JSON-LD article on a page, or None
+
+    The raw response bytes are searched for application/ld+json scripts
+    directly, so nothing else on the page has to be decoded or parsed.
+    Returns a dict with title, content, author, date_published and
+    date_modified (the last three may be empty), but only when the body
+    looks complete: long enough and not marked as paywalled.
+    """
+    best = None
+    for match in _LD_JSON_RE.finditer(raw):
+        try:
+            data = json.loads(_decode(match.group(1), encoding).strip(), strict=False)
+            # Walked up front, since blobs nested too deeply to decode or walk are skipped like malformed ones
+            items = list(_iter_objects(data))
+        except (ValueError, RecursionError):
+            continue
+
+        for item in items:
+            if not _is_article(item) or not isinstance(item.get('articleBody'), str):
+                continue
+            if item.get('isAccessibleForFree') in (False, 'False', 'false'):
+                continue
+            content = text_paragraphs(item['articleBody'])
+            if best is None or len(content) > len(best['content']):
+                best = {
+                    'title': _strip_tags(str(item.get('headline') or item.get('name') or '')),
+                    'content': content,
+                    'author': _names(item.get('author') or item.get('creator')),
+                    'date_published': str(item.get('datePublished') or ''),
+                    'date_modified': str(item.get('dateModified') or '')
+                }
+
+    if best is None or not best['title'] or len(best['content'].split()) < MIN_BODY_WORDS:
+        return None
+    return best
+
+
+def scan_headings(raw, encoding=None):
+    """Return the text of the page's h1-h3 headings in document order, from the raw bytes"""
+    return [_strip_tags(_decode(match.group(2), encoding)) for match in _HEADING_RE.finditer(raw)]
+
+
+def scan_links(raw, base_url, encoding=None):
+    """Return the absolute URLs of the page's links, from the raw bytes"""
+    links = []
+    for match in _LINK_RE.finditer(raw):
+        href = html.unescape(_decode(next(group for group in match.groups() if group is not None), encoding)).strip()
+        if href and not href.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
+            links.append(urljoin(base_url, href))
+    return links
+
+
+def has_next_page(raw):
+    """Check whether the page links a rel="next" continuation"""
+    return _REL_NEXT_RE.search(raw) is not None
+
+
+def microdata_details(soup):
+    """Return the author and dates marked up with microdata itemprops, skipping any that are missing"""
+    details = {}
+    for key, prop in (('author', 'author'), ('date_published', 'datePublished'), ('date_modified', 'dateModified')):
+        element = soup.find(attrs={'itemprop': prop})
+        if element is None:
+            continue
+        if prop == 'author' and element.find(attrs={'itemprop': 'name'}):
+            element = element.find(attrs={'itemprop': 'name'})
+        value = element.get('content') or element.get('datetime') or element.get_text(' ', strip=True)
+        if value:
+            details[key] = value.strip()
+    return details
+
+
+def microdata_article_body(soup):
+    """Return the paragraphs of a microdata itemprop="articleBody" element, or None if it's too short"""
+    body = soup.find(attrs={'itemprop': 'articleBody'})
+    if body is None:
+        return None
+    paragraphs = [p.get_text(' ', strip=True) for p in body.find_all('p')]
+    paragraphs = [p for p in paragraphs if p]
+    if not paragraphs:
+        paragraphs = [line.strip() for line in body.get_text('\n').split('\n') if line.strip()]
+    content = "\n\n".join(paragraphs)
+    if len(content.split()) < MIN_BODY_WORDS:
+        return None
+    return content
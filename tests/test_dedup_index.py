@@ -0,0 +1,85 @@
+import random
+import multiprocessing
+
+from dedup_index import DuplicateIndex, MIN_WORDS, estimate_similarity, minhash_signature
+
+_VOCABULARY = [f"word{i}" for i in range(5000)]
+
+
+def _text(seed, words=400):
+    rng = random.Random(seed)
+    return ' '.join(rng.choice(_VOCABULARY) for _ in range(words))
+
+
+def _edit(text, share, seed=0):
+    """Replace a share of the words in a text"""
+    rng = random.Random(seed)
+    words = text.split()
+    for i in rng.sample(range(len(words)), int(len(words) * share)):
+        words[i] = "changed"
+    return ' '.join(words)
+
+
+def test_short_texts_have_no_signature():
+    assert minhash_signature(' '.join(["word"] * (MIN_WORDS - 1))) is None
+    assert minhash_signature(_text(1, MIN_WORDS)) is not None
+
+
+def test_similarity_estimate_tracks_the_overlap():
+    text = _text(1)
+    signature = minhash_signature(text)
+    assert estimate_similarity(signature, minhash_signature(text)) == 1.0
+    assert estimate_similarity(signature, minhash_signature(_edit(text, 0.02))) > 0.8
+    assert estimate_similarity(signature, minhash_signature(_text(2))) < 0.2
+
+
+def test_near_duplicates_are_matched_to_the_first_copy(tmp_path):
+    index = DuplicateIndex(str(tmp_path / "dedup.db"))
+    original = _text(1)
+    assert index.check_and_add("https://a.example/1", original) is None
+    assert index.check_and_add("https://b.example/1", original.upper()) == "https://a.example/1"
+    assert index.check_and_add("https://c.example/1", _edit(original, 0.02)) == "https://a.example/1"
+    assert index.check_and_add("https://d.example/1", _text(2)) is None
+
+
+def test_texts_below_the_threshold_are_not_duplicates(tmp_path):
+    index = DuplicateIndex(str(tmp_path / "dedup.db"))
+    original = _text(1)
+    index.check_and_add("https://a.example/1", original)
+    # Rewriting a third of the words leaves well under 0.8 of the shingles shared
+    assert index.find_duplicate("https://b.example/1", _edit(original, 0.33)) is None
+
+
+def test_rescraping_a_url_does_not_match_itself(tmp_path):
+    index = DuplicateIndex(str(tmp_path / "dedup.db"))
+    index.check_and_add("https://a.example/1", _text(1))
+    assert index.check_and_add("https://a.example/1", _text(1)) is None
+
+
+def _add_from_another_process(path, url, text, start):
+    start.wait()
+    index = DuplicateIndex(path)
+    try:
+        return index.check_and_add(url, text)
+    finally:
+        index.close()
+
+
+def _race(path, urls, text):
+    context = multiprocessing.get_context('fork')
+    start = context.Manager().Barrier(len(urls))
+    with context.Pool(len(urls)) as pool:
+        return pool.starmap(_add_from_another_process, [(path, url, text, start) for url in urls])
+
+
+def test_copies_indexed_at_once_by_several_processes_are_caught(tmp_path):
+    path = str(tmp_path / "dedup.db")
+    DuplicateIndex(path).close()
+    results = _race(path, [f"https://site{i}.example/story" for i in range(6)], _text(1))
+    assert results.count(None) == 1
+
+
+def test_the_same_url_indexed_at_once_by_several_processes(tmp_path):
+    path = str(tmp_path / "dedup.db")
+    DuplicateIndex(path).close()
+    assert _race(path, ["https://a.example/story"] * 4, _text(1)) == [None] * 4
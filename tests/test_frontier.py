@@ -0,0 +1,88 @@
+import gzip
+
+from frontier import BloomFilter, Frontier, canonicalize_url
+
+
+class _Response:
+    def __init__(self, body):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class _Session:
+    """Serves fixed bodies by URL, in small chunks so the XML is parsed incrementally"""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get(self, url, timeout=None, stream=False):
+        return _Response(self.pages[url])
+
+
+def _frontier(pages, **kwargs):
+    frontier = Frontier("https://news.example/", status_callback=lambda message: None, expected_urls=1000, **kwargs)
+    frontier.session = _Session(pages)
+    return frontier
+
+
+def test_canonicalize_url_drops_tracking_defaults_and_fragments():
+    assert canonicalize_url("HTTPS://News.Example:443/a?utm_source=x&b=2&fbclid=y&a=1#comments") == \
+        "https://news.example/a?a=1&b=2"
+    assert canonicalize_url("http://news.example:8080") == "http://news.example:8080/"
+    assert canonicalize_url("https://news.example/a?b=2&a=1") == canonicalize_url("https://news.example/a?a=1&b=2")
+
+
+def test_bloom_filter_remembers_what_it_has_seen():
+    seen = BloomFilter(capacity=1000, error_rate=0.001)
+    urls = [f"https://news.example/{i}" for i in range(1000)]
+    # A false positive can make add() report a new URL as already seen, but rarely
+    assert sum(seen.add(url) for url in urls) >= 995
+    assert all(url in seen for url in urls)
+    assert not seen.add(urls[0])
+    assert sum(f"https://other.example/{i}" in seen for i in range(10000)) < 50
+
+
+def test_gzipped_sitemap_index_is_followed():
+    index = ('<?xml version="1.0"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+             '<sitemap><loc>https://news.example/sitemap-1.xml</loc></sitemap></sitemapindex>')
+    pages = ''.join(f'<url><loc>https://news.example/story-{i}</loc><priority>0.{i}</priority></url>' for i in range(1, 4))
+    sitemap = ('<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+               f'{pages}<url><loc>https://elsewhere.example/story</loc></url></urlset>')
+    frontier = _frontier({
+        "https://news.example/sitemap.xml.gz": gzip.compress(index.encode()),
+        "https://news.example/sitemap-1.xml": sitemap.encode(),
+    })
+    frontier.add_sitemap("https://news.example/sitemap.xml.gz")
+    # Other sites are left out, and higher priorities come first
+    assert list(frontier) == [f"https://news.example/story-{i}" for i in (3, 2, 1)]
+
+
+def test_rss_and_atom_feeds_are_read():
+    rss = ('<rss version="2.0"><channel><title>News</title>'
+           '<item><title>One</title><link>https://news.example/one</link></item>'
+           '<item><title>Two</title><guid>https://news.example/two</guid></item></channel></rss>')
+    atom = ('<feed xmlns="http://www.w3.org/2005/Atom"><entry><title>Three</title>'
+            '<link rel="alternate" href="/three"/></entry></feed>')
+    frontier = _frontier({"https://news.example/rss": rss.encode(), "https://news.example/atom": atom.encode()})
+    frontier.add_feed("https://news.example/rss")
+    frontier.add_feed("https://news.example/atom")
+    assert list(frontier) == ["https://news.example/one", "https://news.example/two", "https://news.example/three"]
+
+
+def test_links_are_queued_once_and_within_the_depth_limit():
+    frontier = _frontier({}, max_depth=1)
+    frontier.add("https://news.example/", depth=0)
+    assert frontier.pop() == "https://news.example/"
+    assert frontier.add_links(["https://news.example/a", "https://news.example/a#top", "https://news.example/logo.png",
+                               "mailto:desk@news.example"]) == 1
+    assert frontier.pop() == "https://news.example/a"
+    assert frontier.add_links(["https://news.example/b"]) == 0
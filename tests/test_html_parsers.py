@@ -0,0 +1,63 @@
+import html_parsers
+from html_parsers import choose_backend, parse_html, strip_noise
+
+
+def test_strip_noise_removes_noise_elements_and_comments():
+    html = ('<article><script>var a = "<p>x</p>";</script><!-- ad slot --><p>Kept</p>'
+            '<style>p { color: red }</style><svg><path d="M0"/></svg></article>')
+    assert strip_noise(html) == "<article><p>Kept</p></article>"
+
+
+def test_strip_noise_keeps_text_after_self_closing_tags():
+    html = ('<article><p><svg class="icon"/> Share</p><p>Important paragraph</p>'
+            '<iframe src="/embed" /><p>More text</p><footer><svg><use href="#i"/></svg></footer></article>')
+    assert strip_noise(html) == "<article><p> Share</p><p>Important paragraph</p><p>More text</p><footer></footer></article>"
+
+
+def test_parse_html_drops_noise_but_keeps_article_text():
+    soup, _ = parse_html('<html><body><article><p><svg class="icon"/>Share</p><p>Important paragraph</p>'
+                         '<script>var x = 1;</script></article></body></html>')
+    assert soup.find('script') is None
+    assert [p.get_text() for p in soup.find_all('p')] == ["Share", "Important paragraph"]
+
+
+def test_strip_noise_keeps_hyphenated_custom_elements():
+    html = ('<article><svg-icon name="share"></svg-icon><p>First paragraph</p>'
+            '<script-loader src="/a.js"></script-loader><p>Second paragraph</p>'
+            '<footer><svg><use href="#i"/></svg><script>track()</script></footer></article>')
+    assert strip_noise(html) == ('<article><svg-icon name="share"></svg-icon><p>First paragraph</p>'
+                                 '<script-loader src="/a.js"></script-loader><p>Second paragraph</p>'
+                                 '<footer></footer></article>')
+
+
+def _only(monkeypatch, *names):
+    monkeypatch.setattr(html_parsers, 'available_backends', lambda: list(names))
+
+
+def test_choose_backend_uses_lxml_for_well_formed_pages(monkeypatch):
+    _only(monkeypatch, 'lxml', 'html5lib', 'html.parser')
+    assert choose_backend("<html><body><div><p>Text</p></div></body></html>") == 'lxml'
+
+
+def test_choose_backend_sends_broken_markup_to_html5lib(monkeypatch):
+    _only(monkeypatch, 'lxml', 'html5lib', 'html.parser')
+    assert choose_backend("<div>" * 20 + "<p>Text</p>") == 'html5lib'
+    assert choose_backend("<table><tr><td>Cell</td></tr><p>Text</p>") == 'html5lib'
+
+
+def test_choose_backend_falls_back_when_packages_are_missing(monkeypatch):
+    _only(monkeypatch, 'lxml', 'html.parser')
+    assert choose_backend("<div>" * 20 + "<p>Text</p>") == 'lxml'
+    _only(monkeypatch, 'html.parser')
+    assert choose_backend("<html><body><p>Text</p></body></html>") == 'html.parser'
+
+
+def test_divs_in_scripts_and_templates_do_not_count_as_broken(monkeypatch):
+    _only(monkeypatch, 'lxml', 'html5lib', 'html.parser')
+    html = ('<html><body><template>' + '<div class="card">' * 20 + '</template>'
+            '<script>const row = "' + '<div>' * 20 + '";</script><!-- <div><div><div><div><div><div> -->'
+            '<div><p>Text</p></div></body></html>')
+    assert choose_backend(strip_noise(html)) == 'lxml'
+    soup, backend = parse_html(html)
+    assert backend == 'lxml'
+    assert soup.find('p').get_text() == "Text"
@@ -0,0 +1,80 @@
+import json
+
+from hydration_state import find_hydrated_article
+
+
+def _body(word, paragraphs=4):
+    return "".join(f"<p>{' '.join([word] * 60)} {i}</p>" for i in range(paragraphs))
+
+
+def _next_page(page_props, title="Main article headline | Daily News", head=""):
+    data = json.dumps({'props': {'pageProps': page_props}})
+    return (f'<html><head><title>{title}</title>{head}</head><body><div id="__next"></div>'
+            f'<script id="__NEXT_DATA__" type="application/json">{data}</script></body></html>').encode()
+
+
+def test_picks_the_pages_article_over_a_longer_related_story():
+    raw = _next_page({
+        'article': {'title': "Main article headline", 'body': _body("main")},
+        'related': [{'title': "Related long story", 'body': _body("related", paragraphs=12)}],
+    })
+    article = find_hydrated_article(raw, url="https://news.example/2024/main-article-headline")
+    assert article['title'] == "Main article headline"
+    assert "main main" in article['content'] and "related" not in article['content']
+
+
+def test_matches_og_title_or_url_slug_when_title_is_generic():
+    state = {'article': {'headline': "Council approves new budget", 'body': _body("budget")}}
+    og = '<meta property="og:title" content="Council approves new budget">'
+    assert find_hydrated_article(_next_page(state, title="App", head=og), url="https://x.example/a/1")
+    assert find_hydrated_article(_next_page(state, title="App"), url="https://x.example/news/council-approves-budget")
+    # Neither the page title nor the slug say which story the page is about
+    assert find_hydrated_article(_next_page(state, title="App"), url="https://x.example/a/1") is None
+
+
+def test_apollo_cache_references_and_json_parse_state():
+    state = {
+        'ROOT_QUERY': {'article': {'__ref': "Article:1"}},
+        'Article:1': {'title': "Storm hits the coast", 'author': {'__ref': "Author:9"},
+                      'content': _body("storm"), 'publishedAt': 1700000000000},
+        'Author:9': {'name': "Jane Doe"},
+    }
+    literal = json.dumps(json.dumps(state))
+    raw = (f'<html><head><title>Storm hits the coast - Site</title></head><body>'
+           f'<script>window.__APOLLO_STATE__ = JSON.parse({literal});</script></body></html>').encode()
+    article = find_hydrated_article(raw, url="https://x.example/storm")
+    assert article['author'] == "Jane Doe"
+    assert article['date_published'].startswith("2023-11-14")
+
+
+def test_nuxt_devalue_payload_is_revived():
+    payload = [{'data': 1}, {'story': 2}, {'title': 3, 'body': 4}, "Election night live", _body("vote")]
+    raw = (b'<html><head><title>Election night live</title></head><body>'
+           b'<script type="application/json" id="__NUXT_DATA__">' + json.dumps(payload).encode() + b'</script>'
+           b'</body></html>')
+    article = find_hydrated_article(raw, url="https://x.example/live")
+    assert article['title'] == "Election night live"
+
+
+def test_deeply_nested_state_does_not_raise():
+    # Shallow enough for the JSON decoder, deeper than the rich-text walk can recurse
+    levels = 480
+    text = json.dumps("text " * 200)
+    body = '{"children":[' * levels + text + ']}' * levels
+    state = '{"props":{"pageProps":{"article":{"title":"Deep story","body":[' + body + ']}}}}'
+    raw = ('<html><head><title>Deep story</title></head><body>'
+           '<script id="__NEXT_DATA__" type="application/json">' + state + '</script></body></html>').encode()
+    # Either finds the article or gives up on it; a RecursionError would send the page to Selenium
+    find_hydrated_article(raw, url="https://x.example/deep-story")
+
+    deep_json = b'{"a":' * 100000 + b'1' + b'}' * 100000
+    raw = (b'<html><head><title>Deep story</title></head><body>'
+           b'<script id="__NEXT_DATA__" type="application/json">' + deep_json + b'</script></body></html>')
+    assert find_hydrated_article(raw, url="https://x.example/deep-story") is None
+
+
+def test_bogus_epoch_dates_are_left_out():
+    state = {'article': {'title': "Main article headline", 'body': _body("main"),
+                         'publishedAt': 1e300, 'updatedAt': float('nan')}}
+    article = find_hydrated_article(_next_page(state), url="https://news.example/main-article-headline")
+    assert article['date_published'] == '' and article['date_modified'] == ''
@@ -0,0 +1,85 @@
+import time
+
+from job_queue import JobQueue
+
+
+def _article(url):
+    return {'url': url, 'title': "Title", 'headings': ["Title"], 'content': "Body text", 'timestamp': "2025-01-01 00:00:00"}
+
+
+def _queue(tmp_path, **kwargs):
+    kwargs.setdefault('domain_delay', 0)
+    return JobQueue(str(tmp_path / "queue.db"), **kwargs)
+
+
+def test_enqueue_ignores_known_urls(tmp_path):
+    queue = _queue(tmp_path)
+    assert queue.enqueue(["https://a.example/1", "https://a.example/2"]) == 2
+    assert queue.enqueue(["https://a.example/2", "https://a.example/3"]) == 1
+    assert queue.stats()['pending'] == 3
+
+
+def test_claim_is_fifo_and_skips_cooling_domains(tmp_path):
+    queue = _queue(tmp_path, domain_delay=60)
+    queue.enqueue(["https://a.example/1", "https://a.example/2", "https://b.example/1"])
+    assert queue.claim("w1") == "https://a.example/1"
+    # a.example is cooling down, so the next claim moves on to another domain
+    assert queue.claim("w1") == "https://b.example/1"
+    assert queue.claim("w1") is None
+
+
+def test_complete_stores_the_result(tmp_path):
+    queue = _queue(tmp_path)
+    queue.enqueue(["https://a.example/1"])
+    url = queue.claim("w1")
+    assert queue.complete(url, "w1", _article(url))
+    assert queue.is_drained()
+    assert [article['url'] for article in queue.iter_results()] == [url]
+
+
+def test_late_result_from_an_expired_lease_is_discarded(tmp_path):
+    queue = _queue(tmp_path, lease_seconds=0.05)
+    queue.enqueue(["https://a.example/1"])
+    url = queue.claim("w1")
+    time.sleep(0.1)
+
+    # w1 stopped heartbeating, so the URL is handed to w2
+    assert queue.claim("w2") == url
+    assert not queue.complete(url, "w1", _article(url))
+    assert list(queue.iter_results()) == []
+
+    assert queue.complete(url, "w2", _article(url))
+    # A late failure from w1 can't put the finished URL back in the queue
+    assert not queue.fail(url, "w1", "timeout")
+    assert queue.stats() == {'pending': 0, 'leased': 0, 'done': 1, 'failed': 0}
+
+
+def test_fail_from_the_lease_holder_requeues_then_gives_up(tmp_path):
+    queue = _queue(tmp_path, max_attempts=2)
+    queue.enqueue(["https://a.example/1"])
+    for _ in range(2):
+        url = queue.claim("w1")
+        assert queue.fail(url, "w1", "boom")
+    assert queue.stats()['failed'] == 1
+    assert queue.claim("w1") is None
+
+
+def test_skip_needs_the_lease(tmp_path):
+    queue = _queue(tmp_path)
+    queue.enqueue(["https://a.example/1"])
+    url = queue.claim("w1")
+    assert not queue.skip(url, "w2", "Duplicate")
+    assert queue.skip(url, "w1", "Duplicate")
+    assert queue.is_drained()
+
+
+def test_urls_whose_leases_keep_expiring_are_given_up_on(tmp_path):
+    queue = _queue(tmp_path, lease_seconds=0.05, max_attempts=2)
+    queue.enqueue(["https://a.example/1"])
+    for worker_id in ("w1", "w2"):
+        assert queue.claim(worker_id) == "https://a.example/1"
+        time.sleep(0.1)
+
+    assert queue.claim("w3") is None
+    assert queue.stats()['failed'] == 1
+    assert queue.is_drained()
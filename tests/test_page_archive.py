@@ -0,0 +1,71 @@
+import gzip
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from page_archive import PageArchive
+
+
+def _response(url, body, final_url=None, headers=None):
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response.url = final_url or url
+    response.headers = CaseInsensitiveDict(headers or {'Content-Type': "text/html; charset=utf-8"})
+    response._content = body
+    return response
+
+
+def test_response_round_trip(tmp_path):
+    archive = PageArchive(str(tmp_path), writer_name="test")
+    body = "<html><body><p>Grüße</p></body></html>".encode('utf-8')
+    archive.write_response("https://a.example/story", _response("https://a.example/story", body))
+
+    restored = archive.get_response("https://a.example/story")
+    assert restored.content == body
+    assert restored.status_code == 200
+    assert restored.encoding == "utf-8"
+    assert restored.url == "https://a.example/story"
+    assert archive.get_response("https://a.example/other") is None
+    archive.close()
+
+
+def test_files_are_standard_gzipped_warc(tmp_path):
+    archive = PageArchive(str(tmp_path), writer_name="test")
+    archive.write_response("https://a.example/1", _response("https://a.example/1", b"<p>one</p>"))
+    archive.write_rendered("https://a.example/2", "https://a.example/2", "<p>two</p>")
+    archive.close()
+
+    data = gzip.decompress((tmp_path / "test.warc.gz").read_bytes())
+    assert data.count(b"WARC/1.1\r\n") == 3
+    assert b"WARC-Type: warcinfo" in data and b"WARC-Type: response" in data and b"WARC-Type: resource" in data
+
+
+def test_rendered_round_trip(tmp_path):
+    archive = PageArchive(str(tmp_path), writer_name="test")
+    archive.write_rendered("https://a.example/app", "https://a.example/app#/story", "<p>rendered</p>")
+    assert archive.get_rendered("https://a.example/app") == ("https://a.example/app#/story", "<p>rendered</p>")
+    archive.close()
+
+
+def test_redirected_page_is_listed_once(tmp_path):
+    archive = PageArchive(str(tmp_path), writer_name="test")
+    archive.write_response("http://a.example/story",
+                           _response("http://a.example/story", b"<p>story</p>", final_url="https://a.example/story/"))
+    archive.write_response("https://a.example/story?page=2", _response("https://a.example/story?page=2", b"<p>2</p>"),
+                           continuation=True)
+
+    # The final URL still finds the capture, but only the requested URL is an article to re-extract
+    assert archive.get_response("https://a.example/story/").content == b"<p>story</p>"
+    assert archive.article_urls() == ["http://a.example/story"]
+    assert archive.count() == 2
+    archive.close()
+
+
+def test_reads_records_appended_after_the_file_was_mapped(tmp_path):
+    archive = PageArchive(str(tmp_path), writer_name="test")
+    archive.write_response("https://a.example/1", _response("https://a.example/1", b"<p>one</p>"))
+    assert archive.get_response("https://a.example/1").content == b"<p>one</p>"
+    archive.write_response("https://a.example/2", _response("https://a.example/2", b"<p>two</p>"))
+    assert archive.get_response("https://a.example/2").content == b"<p>two</p>"
+    archive.close()
@@ -0,0 +1,59 @@
+from bs4 import BeautifulSoup
+
+from pagination import MAX_PAGES, find_page_urls, split_page_url, stitch_pages
+
+
+def _soup(body):
+    return BeautifulSoup(f"<html><body>{body}</body></html>", "html.parser")
+
+
+def test_split_page_url_query_parameter():
+    assert split_page_url("https://Example.com/story?id=7&page=3") == ("https://example.com/story?id=7", 3)
+
+
+def test_split_page_url_path_forms():
+    assert split_page_url("https://example.com/story/page/2/") == ("https://example.com/story", 2)
+    assert split_page_url("https://example.com/story/2") == ("https://example.com/story", 2)
+    assert split_page_url("https://example.com/story-3.html") == ("https://example.com/story.html", 3)
+
+
+def test_split_page_url_without_page_number():
+    assert split_page_url("https://example.com/story") is None
+    assert split_page_url("https://example.com/story?sort=new") is None
+
+
+def test_find_page_urls_follows_rel_next():
+    soup = _soup('<a rel="next" href="/story?page=2">More</a>')
+    assert find_page_urls(soup, "https://example.com/story") == [(2, "https://example.com/story?page=2")]
+
+
+def test_find_page_urls_fills_gaps_from_page_of_text():
+    soup = _soup('<p>Page 1 of 4</p><div class="pagination"><a href="/story/page/2">2</a></div>')
+    pages = find_page_urls(soup, "https://example.com/story")
+    assert [number for number, _ in pages] == [2, 3, 4]
+    assert pages[-1][1] == "https://example.com/story/page/4"
+
+
+def test_find_page_urls_ignores_other_articles():
+    soup = _soup('<a rel="next" href="/other-story?page=2">Next article</a><a href="/story-2.html">2</a>')
+    assert find_page_urls(soup, "https://example.com/story") == []
+
+
+def test_find_page_urls_caps_runaway_pagers():
+    soup = _soup('<p>Page 1 of 500</p><a rel="next" href="/story?page=2">Next</a>')
+    pages = find_page_urls(soup, "https://example.com/story")
+    assert max(number for number, _ in pages) == MAX_PAGES
+
+
+def test_stitch_pages_drops_repeats_and_pager_text():
+    headings, content = stitch_pages([
+        (["Title", "Part one"], "Byline\n\nFirst paragraph.\n\nPage 1 of 2"),
+        (["Title", "Part two"], "Byline\n\nSecond paragraph.\n\nPage 2 of 2"),
+    ])
+    assert headings == ["Title", "Part one", "Part two"]
+    assert content == "Byline\n\nFirst paragraph.\n\nSecond paragraph."
+
+
+def test_stitch_pages_skips_empty_pages():
+    assert stitch_pages([(["Title"], "No content found"), ([], "Text")]) == (["Title"], "Text")
+    assert stitch_pages([(["Title"], "No content found")]) == (["Title"], "No content found")
@@ -0,0 +1,60 @@
+import json
+import threading
+
+import profiling
+
+
+def test_spans_are_written_as_trace_events(tmp_path):
+    profiler = profiling.start_profiling(use_cprofile=True, use_tracemalloc=True)
+    try:
+        with profiling.profile_url("https://news.example/story"):
+            with profiling.span("fetch", url="https://news.example/story") as args:
+                args['bytes'] = 1024
+            with profiling.span("parse_lxml"):
+                sum(range(10000))
+    finally:
+        assert profiling.stop_profiling() is profiler
+
+    trace_path, summary_path = profiler.write(str(tmp_path / "profiles" / "run"))
+    with open(trace_path, encoding='utf-8') as f:
+        trace = json.load(f)
+
+    events = {event['name']: event for event in trace['traceEvents'] if event['ph'] == 'X'}
+    assert set(events) == {'scrape_url', 'fetch', 'parse_lxml'}
+    assert events['fetch']['args'] == {'url': "https://news.example/story", 'bytes': '1024'}
+    assert 'peak_kb' in events['scrape_url']['args']
+    for event in events.values():
+        assert {'ts', 'dur', 'pid', 'tid'} <= set(event) and event['dur'] >= 0
+    # Nested spans lie within the span around the whole URL
+    outer, inner = events['scrape_url'], events['parse_lxml']
+    assert outer['ts'] <= events['fetch']['ts'] and inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur']
+    assert any(event['ph'] == 'M' and event['name'] == 'thread_name' for event in trace['traceEvents'])
+
+    with open(summary_path, encoding='utf-8') as f:
+        summary = f.read()
+    assert "parse_lxml" in summary and "https://news.example/story" in summary
+    assert "(cProfile)" in summary and "(tracemalloc)" in summary
+
+
+def test_spans_do_nothing_while_profiling_is_off():
+    assert profiling.stop_profiling() is None
+    with profiling.profile_url("https://news.example/story"):
+        with profiling.span("fetch") as args:
+            args['bytes'] = 1024
+
+
+def test_null_spans_give_each_caller_its_own_dict():
+    seen = []
+
+    def record(i):
+        with profiling.span("fetch") as args:
+            args['n'] = i
+            seen.append(args)
+
+    threads = [threading.Thread(target=record, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(args['n'] for args in seen) == list(range(8))
+    assert len({id(args) for args in seen}) == 8
@@ -0,0 +1,63 @@
+import multiprocessing
+import os
+import pickle
+
+from record_store import ArticleRecord, BlobStore, compress_text, decompress_text, open_blob_store
+
+
+def _article(url="https://News.example/story", **fields):
+    return {'url': url, 'title': "Story", 'headings': ["Story", "Background"],
+            'content': "First paragraph.\n\nSecond paragraph, with ünïcode.", 'timestamp': "2025-01-02 03:04:05", **fields}
+
+
+def test_compression_round_trip():
+    text = "Long article text. " * 1000
+    blob = compress_text(text)
+    assert len(blob) < len(text) // 10
+    assert decompress_text(blob) == text
+
+
+def test_blob_store_round_trip(tmp_path):
+    store = BlobStore(str(tmp_path / "articles.blob"))
+    references = [store.append(f"Article {i} " * 50) for i in range(20)]
+    assert [store.read(*reference) for reference in references] == [f"Article {i} " * 50 for i in range(20)]
+    store.close()
+
+
+def test_temporary_store_is_removed_on_close():
+    store = BlobStore()
+    assert os.path.exists(store.path)
+    store.close()
+    assert not os.path.exists(store.path)
+
+
+def test_record_reads_back_as_the_scraper_dict(tmp_path):
+    store = open_blob_store(str(tmp_path / "articles.blob"))
+    record = ArticleRecord.from_article(_article(author="Ann Lee", duplicate_of="https://a.example/x"), store)
+    assert record.domain == "news.example"
+    assert record['content'] == "First paragraph.\n\nSecond paragraph, with ünïcode."
+    assert record.get('author') == "Ann Lee" and record.get('date_published') is None
+    assert record.to_dict() == _article(author="Ann Lee", duplicate_of="https://a.example/x")
+    store.close()
+
+
+def _load_in_child(data, results):
+    record = pickle.loads(data)
+    results.put(record.to_dict())
+
+
+def test_pickled_record_is_read_in_another_process(tmp_path):
+    store = open_blob_store(str(tmp_path / "articles.blob"))
+    record = ArticleRecord.from_article(_article(date_published="2025-01-01"), store)
+    data = pickle.dumps(record)
+    # The pickle holds the blob's path and offset, not the body
+    assert b"Second paragraph" not in data
+
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    child = context.Process(target=_load_in_child, args=(data, results))
+    child.start()
+    loaded = results.get(timeout=30)
+    child.join()
+    assert loaded == _article(date_published="2025-01-01")
+    store.close()
@@ -0,0 +1,66 @@
+import pytest
+
+from search_index import SearchIndex
+
+
+def _article(url, title, content, timestamp="2025-03-10 12:00:00", **fields):
+    return {'url': url, 'title': title, 'headings': [title], 'content': content, 'timestamp': timestamp, **fields}
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.db"))
+    index.add_articles([
+        _article("https://www.news.example/rates", "Central bank raises interest rates",
+                 "The central bank raised rates again.", author="Ann Lee"),
+        _article("https://markets.news.example/bonds", "Bond markets react",
+                 "Investors expect interest rates to stay high.", "2025-01-05 09:00:00", author="Bo Chan, Ann Lee"),
+        _article("https://other.example/rates", "Rates explained", "What interest rates mean for savers.",
+                 "2024-12-20 18:00:00"),
+    ])
+    yield index
+    index.close()
+
+
+def _urls(results):
+    return [result['url'] for result in results]
+
+
+def test_title_matches_rank_first(index):
+    results = index.search("interest rates")
+    assert len(results) == 3
+    assert results[0]['url'] == "https://www.news.example/rates"
+
+
+def test_domain_filter_includes_subdomains(index):
+    assert sorted(_urls(index.search("rates", domain="News.Example"))) == [
+        "https://markets.news.example/bonds", "https://www.news.example/rates"]
+    assert _urls(index.search("rates", domain="www.news.example")) == _urls(index.search("rates", domain="news.example"))
+    assert _urls(index.search("rates", domain="other.example")) == ["https://other.example/rates"]
+
+
+def test_author_filter_matches_part_of_the_byline(index):
+    assert sorted(_urls(index.search("rates", author="ann lee"))) == [
+        "https://markets.news.example/bonds", "https://www.news.example/rates"]
+    assert _urls(index.search("rates", author="Chan")) == ["https://markets.news.example/bonds"]
+    assert index.search("rates", author="Nobody") == []
+
+
+def test_date_filters_include_the_whole_until_day(index):
+    assert _urls(index.search("rates", since="2025-01-01", until="2025-01-05")) == ["https://markets.news.example/bonds"]
+    assert _urls(index.search("rates", until="2024-12-20")) == ["https://other.example/rates"]
+    with pytest.raises(ValueError):
+        index.search("rates", since="March")
+
+
+def test_bad_fts_syntax_falls_back_to_literal_words(index):
+    assert _urls(index.search('"central bank')) == ["https://www.news.example/rates"]
+    assert _urls(index.search("bank AND")) == []
+    assert _urls(index.search("savers)")) == ["https://other.example/rates"]
+
+
+def test_reindexing_a_url_replaces_it(index):
+    index.add_articles([_article("https://other.example/rates", "Rates explained", "Now about mortgages.")])
+    assert index.count() == 3
+    assert index.search("savers") == []
+    assert _urls(index.search("mortgages")) == ["https://other.example/rates"]
@@ -0,0 +1,110 @@
+import json
+from types import SimpleNamespace
+
+from scraper_core import ArticleScraper
+from structured_data import MIN_BODY_WORDS, find_json_ld_article
+
+
+def _words(word, count):
+    return ' '.join([word] * count)
+
+
+def _page(*blobs):
+    scripts = ''.join(f'<script type="application/ld+json">{blob}</script>' for blob in blobs)
+    return f'<html><head>{scripts}</head><body><p>Teaser</p></body></html>'.encode()
+
+
+def _article(**fields):
+    return json.dumps({'@type': 'NewsArticle', 'headline': "Council approves budget",
+                       'articleBody': _words("budget", 200), **fields})
+
+
+def test_deeply_nested_blobs_are_skipped():
+    nested = '{"@type": "WebPage", "x": ' * 5000 + '{}' + '}' * 5000
+    article = find_json_ld_article(_page(nested, _article()))
+    assert article['title'] == "Council approves budget"
+    assert find_json_ld_article(_page(nested)) is None
+
+
+def test_unknown_charset_is_read_as_utf8():
+    scraper = ArticleScraper(status_callback=lambda message: None)
+    response = SimpleNamespace(content=_page(_article(headline="Café council approves budget")),
+                               encoding='utf8mb4', url="https://news.example/budget")
+    article_data = scraper._scrape_structured_data(response, response.url)
+    scraper.close()
+    assert article_data['title'] == "Café council approves budget"
+
+
+def test_graph_and_list_documents_are_searched():
+    graph = json.dumps({'@context': "https://schema.org", '@graph': [
+        {'@type': 'WebSite', 'name': "Daily News"},
+        json.loads(_article(author=[{'@type': 'Person', 'name': "Ann Lee"}, "Bo Chan"], datePublished="2024-05-01")),
+    ]})
+    article = find_json_ld_article(_page(graph))
+    assert article['title'] == "Council approves budget"
+    assert article['author'] == "Ann Lee, Bo Chan"
+    assert article['date_published'] == "2024-05-01"
+
+    listed = json.dumps([{'@type': 'BreadcrumbList'}, json.loads(_article(**{'@type': 'https://schema.org/BlogPosting'}))])
+    assert find_json_ld_article(_page(listed))['content'] == _words("budget", 200)
+
+
+def test_the_longest_article_body_wins():
+    teaser = _article(headline="Teaser", articleBody=_words("teaser", 160))
+    assert find_json_ld_article(_page(teaser, _article()))['title'] == "Council approves budget"
+
+
+def test_short_bodies_fail_the_completeness_gate():
+    assert find_json_ld_article(_page(_article(articleBody=_words("stub", MIN_BODY_WORDS - 1)))) is None
+    assert find_json_ld_article(_page(_article(articleBody=_words("full", MIN_BODY_WORDS)))) is not None
+
+
+def test_malformed_json_is_skipped():
+    assert find_json_ld_article(_page('{"@type": "NewsArticle", "headline": ', _article())) is not None
+    assert find_json_ld_article(_page('{not json}')) is None
+
+
+def test_article_body_markup_becomes_paragraphs():
+    body = "<p>" + _words("first", 100) + "</p><p>" + _words("second", 100) + "</p>"
+    article = find_json_ld_article(_page(_article(articleBody=body)))
+    assert article['content'] == _words("first", 100) + "\n\n" + _words("second", 100)
+
+
+class _Response:
+    def __init__(self, html, url="https://news.example/budget"):
+        self.content = html.encode('utf-8')
+        self.text = html
+        self.encoding = 'utf-8'
+        self.apparent_encoding = 'utf-8'
+        self.url = url
+
+
+def _scrape(html):
+    scraper = ArticleScraper(status_callback=lambda message: None)
+    try:
+        return scraper._scrape_with_beautifulsoup("https://news.example/budget", _Response(html))
+    finally:
+        scraper.close()
+
+
+def test_paywalled_json_ld_falls_back_to_the_dom():
+    ld = _article(isAccessibleForFree=False, articleBody=_words("preview", 200))
+    html = (f'<html><head><title>Council approves budget</title><script type="application/ld+json">{ld}</script>'
+            f'</head><body><article><h1>Council approves budget</h1><p>{_words("visible", 120)}</p>'
+            f'<p>{_words("paragraph", 120)}</p></article></body></html>')
+    assert find_json_ld_article(html.encode()) is None
+    article_data = _scrape(html)
+    assert "visible visible" in article_data['content'] and "preview" not in article_data['content']
+
+
+def test_microdata_article_body_and_details_are_used():
+    html = ('<html><head><title>Council approves budget</title></head><body>'
+            '<div itemscope itemtype="https://schema.org/NewsArticle"><h1 itemprop="headline">Council approves budget</h1>'
+            '<span itemprop="author" itemscope><span itemprop="name">Ann Lee</span></span>'
+            '<time itemprop="datePublished" datetime="2024-05-01T09:00:00Z">May 1</time>'
+            f'<div itemprop="articleBody"><p>{_words("first", 100)}</p><p>{_words("second", 100)}</p></div>'
+            f'<aside><p>{_words("sidebar", 300)}</p></aside></div></body></html>')
+    article_data = _scrape(html)
+    assert article_data['content'] == _words("first", 100) + "\n\n" + _words("second", 100)
+    assert article_data['author'] == "Ann Lee"
+    assert article_data['date_published'] == "2024-05-01T09:00:00Z"
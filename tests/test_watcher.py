@@ -0,0 +1,101 @@
+import time
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+
+import watcher
+from watchlist import Watchlist, diff_articles
+
+
+class _Response:
+    def __init__(self, body):
+        self.content = body.encode('utf-8')
+        self.headers = CaseInsensitiveDict({'ETag': f'"{hash(body)}"'})
+
+
+class _FakeScraper:
+    """Serves one page whose article text the test can change, and answers 304 when the ETag matches"""
+
+    pages = {}
+
+    def __init__(self, status_callback=None):
+        self.rate_limiter = None
+        self.archive = None
+
+    def fetch_if_modified(self, url, etag=None, last_modified=None):
+        response = _Response(self.pages[url])
+        return None if etag == response.headers['ETag'] else response
+
+    def scrape(self, url, response):
+        return {'url': url, 'title': "Story", 'headings': ["Story"], 'content': response.content.decode('utf-8'),
+                'timestamp': "2025-01-01 00:00:00", 'links': []}
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def watch(tmp_path, monkeypatch):
+    monkeypatch.setattr(watcher, 'ArticleScraper', _FakeScraper)
+    exports = []
+    monkeypatch.setattr(watcher, 'export_to_excel', lambda articles, output_dir, prefix: exports.append(articles) or "x.xlsx")
+    path = str(tmp_path / "watchlist.db")
+    watchlist = Watchlist(path)
+    watchlist.add(["https://a.example/story"], interval=0)
+    watchlist.close()
+
+    def run(**kwargs):
+        kwargs.setdefault('status_callback', lambda message: None)
+        return watcher.run_watch(path, str(tmp_path), once=True, domain_delay=0, **kwargs)
+    return run, exports
+
+
+def test_new_then_unchanged_then_changed(watch):
+    run, exports = watch
+    _FakeScraper.pages = {"https://a.example/story": "First paragraph.\n\nSecond paragraph."}
+    assert run() == 1 and exports[-1][0]['change'] == "New"
+
+    time.sleep(0.01)
+    assert run() == 0
+
+    _FakeScraper.pages = {"https://a.example/story": "First paragraph.\n\nSecond paragraph, corrected."}
+    time.sleep(0.01)
+    assert run() == 1
+    change = exports[-1][0]
+    assert change['change'] == "Changed"
+    assert change['content_diff'] == "@@ -2 +2 @@\n-Second paragraph.\n+Second paragraph, corrected."
+
+
+def test_failed_export_leaves_the_change_to_be_found_again(watch, monkeypatch):
+    run, exports = watch
+    _FakeScraper.pages = {"https://a.example/story": "Text."}
+
+    def fail(articles, output_dir, prefix):
+        raise OSError("disk full")
+    with monkeypatch.context() as patch:
+        patch.setattr(watcher, 'export_to_excel', fail)
+        assert run() == 0
+
+    # Nothing was saved by the failed round, so the next one reports the page again
+    time.sleep(0.01)
+    assert run() == 1
+    assert exports[-1][0]['change'] == "New"
+
+
+def test_broken_search_index_is_reported_without_stopping_the_watch(watch, tmp_path):
+    run, exports = watch
+    _FakeScraper.pages = {"https://a.example/story": "Text."}
+    index_path = tmp_path / "search.db"
+    index_path.write_bytes(b"not a database" * 100)
+
+    messages = []
+    assert run(search_index_path=str(index_path), status_callback=messages.append) == 1
+    assert any(message.startswith("Error updating search index") for message in messages)
+
+
+def test_diff_articles_lists_only_changed_headings_and_paragraphs():
+    old = {'headings': ["Title", "Old section"], 'content': "A\n\nB\n\nC"}
+    new = {'headings': ["Title", "New section"], 'content': "A\n\nB2\n\nC"}
+    headings_diff, content_diff = diff_articles(old, new)
+    assert headings_diff == "- Old section\n+ New section"
+    assert content_diff == "@@ -2 +2 @@\n-B\n+B2"
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# ExcellentScraper - Re-check watched URLs on their schedules and export only what changed
+
+import os
+import time
+import hashlib
+import datetime
+from scraper_core import ArticleScraper, RateLimiter, export_to_excel
+from page_archive import PageArchive
+from watchlist import Watchlist, content_hash, diff_articles
+
+# Longest the scheduler sleeps at once, so URLs added while it runs are picked up
+MAX_SLEEP = 60
+
+
+def _log(message):
+    """Print a timestamped status line"""
+    current_time = datetime.datetime.now().strftime("%H:%M:%S")
+    print(f"[{current_time}] {message}", flush=True)
+
+
+def check_url(scraper, watchlist, entry):
+    """Check one watched URL, returning (article with change details, new state) if it's new or changed, else None
+
+    The cheap tests run first: a 304 to the conditional request, then an
+    identical response body, and only then is the page extracted and its
+    article hash compared, so pages that only changed around the article
+    aren't reported either. A change isn't saved to the watchlist here:
+    the caller saves the new state with Watchlist.mark_changed once the
+    change has been exported, so an interrupted round is checked again.
+    """
+    url = entry['url']
+    response = scraper.fetch_if_modified(url, entry['etag'], entry['last_modified'])
+    if response is None:
+        watchlist.mark_unchanged(url)
+        return None
+
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    body_hash = hashlib.sha1(response.content).hexdigest()
+    if body_hash == entry['body_hash']:
+        watchlist.mark_unchanged(url, etag, last_modified)
+        return None
+
+    article_data = scraper.scrape(url, response)
+    article_data.pop('links', None)
+    article_hash = content_hash(article_data)
+    if article_hash == entry['content_hash']:
+        watchlist.mark_unchanged(url, etag, last_modified, body_hash)
+        return None
+
+    previous = watchlist.snapshot(url)
+    if previous is None:
+        article_data['change'] = "New"
+    else:
+        article_data['change'] = "Changed"
+        article_data['headings_diff'], article_data['content_diff'] = diff_articles(previous, article_data)
+    return article_data, (etag, last_modified, body_hash, article_hash)
+
+
+def run_watch(watchlist_path, output_dir, once=False, domain_delay=1.0, archive_path=None, search_index_path=None,
+              status_callback=_log):
+    """Re-check watched URLs as they come due, exporting each round's new and changed articles
+
+    Every round checks the URLs that are due and writes the ones that are
+    new or changed to a changes_<time>.xlsx file, with a diff of their
+    headings and content; unchanged URLs produce no output at all. With
+    once, a single round runs and the function returns, for running from
+    cron; otherwise it sleeps until the next URL is due, indefinitely.
+    Returns the number of changed articles exported.
+    """
+    watchlist = Watchlist(watchlist_path)
+    scraper = ArticleScraper(status_callback=lambda message: None)
+    scraper.rate_limiter = RateLimiter(domain_delay)
+    scraper.archive = PageArchive(archive_path) if archive_path else None
+    os.makedirs(output_dir, exist_ok=True)
+
+    exported = 0
+    try:
+        while True:
+            due = watchlist.due()
+            if not due:
+                if once:
+                    break
+                next_check = watchlist.next_check()
+                time.sleep(MAX_SLEEP if next_check is None else min(max(next_check - time.time(), 1), MAX_SLEEP))
+                continue
+
+            status_callback(f"Checking {len(due)} watched URLs")
+            changes = []
+            for entry in due:
+                try:
+                    change = check_url(scraper, watchlist, entry)
+                except Exception as e:
+                    status_callback(f"Error checking {entry['url']}: {str(e)}")
+                    watchlist.mark_failed(entry['url'], e)
+                    continue
+                if change:
+                    status_callback(f"{change[0]['change']}: {entry['url']}")
+                    changes.append(change)
+
+            status_callback(f"{len(changes)} of {len(due)} URLs new or changed")
+            if changes:
+                articles = [article_data for article_data, _ in changes]
+                try:
+                    filename = export_to_excel(articles, output_dir, prefix='changes')
+                except Exception as e:
+                    # Nothing is saved, so these changes are found and exported again on a later check
+                    status_callback(f"Error exporting changes: {str(e)}")
+                    for article_data, _ in changes:
+                        watchlist.mark_failed(article_data['url'], e)
+                else:
+                    status_callback(f"Exported changes to: {filename}")
+
+                    # Only now do the new versions become the ones later checks compare against
+                    for article_data, state in changes:
+                        watchlist.mark_changed(article_data['url'], article_data, *state)
+                    exported += len(changes)
+
+                    if search_index_path:
+                        # Re-indexing a URL replaces its earlier version. The changes are already exported,
+                        # so a locked or broken index is reported without stopping the watch
+                        from search_index import SearchIndex
+                        try:
+                            search_index = SearchIndex(search_index_path)
+                            try:
+                                search_index.add_articles(articles)
+                            finally:
+                                search_index.close()
+                        except Exception as e:
+                            status_callback(f"Error updating search index: {str(e)}")
+
+            if once:
+                break
+    finally:
+        scraper.close()
+        if scraper.archive:
+            scraper.archive.close()
+        watchlist.close()
+
+    return exported
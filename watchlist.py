@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# ExcellentScraper - Watchlist of article URLs that are re-checked for changes on a schedule
+
+import json
+import time
+import difflib
+import hashlib
+import sqlite3
+from record_store import compress_text, decompress_text, METADATA_KEYS
+
+# Seconds between checks of a newly watched URL
+DEFAULT_INTERVAL = 3600
+
+# Each check that finds no change doubles a URL's interval, up to this many times its base interval
+MAX_BACKOFF = 16
+
+
+def content_hash(article_data):
+    """Hash the extracted article, so markup, ads and timestamps in the page chrome don't count as changes"""
+    parts = [article_data['title'], *article_data['headings'], article_data['content']]
+    normalized = '\n'.join(' '.join(str(part).split()) for part in parts)
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+def diff_articles(old, new):
+    """Return (headings diff, content diff) between two versions of an article
+
+    Headings are listed as "+ added" and "- removed" lines. The content is
+    compared paragraph by paragraph and reported as unified diff hunks
+    with no context, so only the paragraphs that changed are shown.
+    """
+    headings_diff = '\n'.join(
+        line for line in difflib.ndiff(old['headings'], new['headings']) if line.startswith(('+ ', '- '))
+    )
+    content_diff = '\n'.join(
+        line for line in difflib.unified_diff(old['content'].split("\n\n"), new['content'].split("\n\n"),
+                                              n=0, lineterm='')
+        if not line.startswith(('---', '+++'))
+    )
+    return headings_diff, content_diff
+
+
+class Watchlist:
+    """URLs to re-check on their own intervals, with the last version seen of each, in a SQLite file
+
+    Along with the article itself, each URL keeps the ETag and
+    Last-Modified validators from its last response, so checks can be
+    conditional requests, and hashes of the raw page and the extracted
+    article, so a page that was re-served unchanged costs no parsing.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+        # The default isolation level, so each "with self.conn" block is one transaction
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS watched (
+                url TEXT PRIMARY KEY,
+                base_interval REAL NOT NULL,
+                interval REAL NOT NULL,
+                next_check REAL NOT NULL,
+                unchanged INTEGER NOT NULL DEFAULT 0,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT,
+                content_hash TEXT,
+                snapshot BLOB,
+                last_checked REAL,
+                last_changed REAL,
+                error TEXT,
+                added_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS watched_next_check ON watched (next_check);
+        """)
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+    def add(self, urls, interval=DEFAULT_INTERVAL):
+        """Start watching URLs, checking each one right away; URLs already watched keep their state"""
+        now = time.time()
+        with self.conn:
+            cursor = self.conn.executemany(
+                "INSERT OR IGNORE INTO watched (url, base_interval, interval, next_check, added_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(url, interval, interval, now, now) for url in urls]
+            )
+        return cursor.rowcount
+
+    def remove(self, urls):
+        """Stop watching URLs"""
+        with self.conn:
+            cursor = self.conn.executemany("DELETE FROM watched WHERE url = ?", [(url,) for url in urls])
+        return cursor.rowcount
+
+    def due(self, now=None):
+        """Return the URLs whose next check is due, longest overdue first, with their validators and hashes"""
+        cursor = self.conn.execute(
+            "SELECT url, etag, last_modified, body_hash, content_hash FROM watched "
+            "WHERE next_check <= ? ORDER BY next_check",
+            (now or time.time(),)
+        )
+        return [
+            {'url': url, 'etag': etag, 'last_modified': last_modified, 'body_hash': body_hash,
+             'content_hash': article_hash}
+            for url, etag, last_modified, body_hash, article_hash in cursor
+        ]
+
+    def snapshot(self, url):
+        """Return the last version seen of an article (title, headings, content), or None if it's new"""
+        row = self.conn.execute("SELECT snapshot FROM watched WHERE url = ?", (url,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return json.loads(decompress_text(row[0]))
+
+    def next_check(self):
+        """Return the time of the earliest scheduled check, or None if nothing is watched"""
+        return self.conn.execute("SELECT MIN(next_check) FROM watched").fetchone()[0]
+
+    def mark_unchanged(self, url, etag=None, last_modified=None, body_hash=None):
+        """Record a check that found no change and back off: the URL's interval doubles, up to its cap"""
+        now = time.time()
+        with self.conn:
+            self.conn.execute("""
+                UPDATE watched
+                SET interval = MIN(interval * 2, base_interval * ?),
+                    next_check = ? + MIN(interval * 2, base_interval * ?),
+                    unchanged = unchanged + 1,
+                    etag = COALESCE(?, etag),
+                    last_modified = COALESCE(?, last_modified),
+                    body_hash = COALESCE(?, body_hash),
+                    last_checked = ?, error = NULL
+                WHERE url = ?
+            """, (MAX_BACKOFF, now, MAX_BACKOFF, etag, last_modified, body_hash, now, url))
+
+    def mark_changed(self, url, article_data, etag, last_modified, body_hash, article_hash):
+        """Save the new version of an article and return the URL to its base interval"""
+        snapshot = {key: article_data[key] for key in ('title', 'headings', 'content')}
+        snapshot.update((key, article_data[key]) for key in METADATA_KEYS if article_data.get(key))
+        now = time.time()
+        with self.conn:
+            self.conn.execute("""
+                UPDATE watched
+                SET interval = base_interval, next_check = ? + base_interval, unchanged = 0,
+                    etag = ?, last_modified = ?, body_hash = ?, content_hash = ?, snapshot = ?,
+                    last_checked = ?, last_changed = ?, error = NULL
+                WHERE url = ?
+            """, (now, etag, last_modified, body_hash, article_hash, compress_text(json.dumps(snapshot)),
+                  now, now, url))
+
+    def mark_failed(self, url, error):
+        """Record a failed check, backing off the same way as an unchanged one"""
+        now = time.time()
+        with self.conn:
+            self.conn.execute("""
+                UPDATE watched
+                SET interval = MIN(interval * 2, base_interval * ?),
+                    next_check = ? + MIN(interval * 2, base_interval * ?),
+                    last_checked = ?, error = ?
+                WHERE url = ?
+            """, (MAX_BACKOFF, now, MAX_BACKOFF, now, str(error), url))
+
+    def entries(self):
+        """Yield (url, interval, next check, last changed, error) for every watched URL, soonest first"""
+        yield from self.conn.execute(
+            "SELECT url, interval, next_check, last_changed, error FROM watched ORDER BY next_check"
+        )